@@ -1,44 +1,182 @@
+import os
 import streamlit as st
+import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
 from datetime import date, timedelta, datetime
-import pytz
+from zoneinfo import ZoneInfo
 
 
-from utils.db_utils import read_todos, add_todo, update_todo_status, delete_todo, update_todo_hours, ensure_csv_exists, get_todo_steps, update_todo_step, get_todo_progress
+from utils.db_utils import read_todos, read_todos_df, add_todo, import_todos_csv, bulk_update_status, bulk_delete, update_todo_hours, apply_updates, ensure_csv_exists, todos_store_mtime, read_all_steps, steps_progress, read_timetable, write_timetable, load_timetable_csv, generate_ulid, TIMETABLE_CSV_PATH
 from utils.charts import tasks_by_status_chart, upcoming_deadlines_table, tasks_risk_dataframe
+from utils.categories import extract_category
 
 st.set_page_config(page_title="Study Todo Tracker", layout="wide")
 
 # Set timezone to New York 
-NY_TZ = pytz.timezone('America/New_York')
+NY_TZ = ZoneInfo('America/New_York')
 
-def get_ny_date():
-	"""Get current date in New York timezone"""
-	return datetime.now(NY_TZ).date()
+# Maximum rows rendered in the Logged Hours Summary editor
+HOURS_SUMMARY_LIMIT = 100
+# Open todos whose step checklists are rendered per page
+STEPS_PAGE_SIZE = 25
 
 def get_ny_datetime():
 	"""Get current datetime in New York timezone"""
 	return datetime.now(NY_TZ)
 
-if "initialized" not in st.session_state:
+# One clock reading per script run so every tab agrees on "today" (NY time)
+_NOW = get_ny_datetime()
+_TODAY = _NOW.date()
+
+@st.cache_data(show_spinner=False)
+def _cached_read_todos(mtime: float):
+	"""Todos keyed on the CSV mtime; any write bumps the mtime and misses the cache"""
+	return read_todos()
+
+@st.cache_data(show_spinner=False)
+def _cached_read_all_steps(mtime: float, todo_ids: tuple):
+	"""Steps for the given todos from one CSV read, keyed on the CSV mtime"""
+	return read_all_steps(todo_ids)
+
+@st.cache_data(show_spinner=False)
+def _cached_read_timetable(mtime: float):
+	"""Timetable rows keyed on the CSV mtime"""
+	return read_timetable()
+
+@st.cache_data(show_spinner=False)
+def _cached_load_timetable_csv(path: str, mtime: float):
+	"""Parsed preload timetable, re-parsed only when the source file changes"""
+	return load_timetable_csv(path)
+
+@st.cache_data(show_spinner=False)
+def _prepare_todos_df(mtime: float) -> pd.DataFrame:
+	"""Normalized todos frame shared by every tab, built once per CSV version"""
+	# Every CSV column is present (missing completed_at etc. read back as "")
+	df = read_todos_df()
+	# Cast once at load so downstream tabs work on native float64/datetime64 columns
+	df["hours_logged"] = pd.to_numeric(df["hours_logged"], errors='coerce').fillna(0).astype("float64")
+	df["estimated_hours"] = pd.to_numeric(df["estimated_hours"], errors='coerce').fillna(0).astype("float64")
+	# Few distinct categories: a Categorical lets groupby/crosstab work on integer codes
+	df["category"] = extract_category(df["title"]).astype("category")
+	df["due_dt"] = pd.to_datetime(df["due_date"], format="%Y-%m-%d", errors="coerce", cache=True)
+	# Completion timestamps are mixed-format and tz-aware; convert to naive NY time once for every dashboard section
+	# format="mixed" parses each value on its own; inferring one format from the first value would turn the rest into NaT
+	df["completed_dt"] = pd.to_datetime(df["completed_at"], format="mixed", errors="coerce", utc=True).dt.tz_convert(NY_TZ).dt.tz_localize(None)
+	df["completed_date"] = df["completed_dt"].dt.normalize()
+	df["delay_days"] = (df["completed_dt"] - df["due_dt"]).dt.days
+	# Display text keeps the stored wall-clock time (offset dropped), falling back to the raw value
+	completed_wall = pd.to_datetime(df["completed_at"].str.slice(0, 19), format="ISO8601", errors="coerce")
+	df["completed_display"] = completed_wall.dt.strftime("%Y-%m-%d %H:%M").fillna(df["completed_at"].fillna(""))
+	return df
+
+@st.cache_data(show_spinner=False)
+def _dashboard_aggregates(mtime: float) -> dict:
+	"""Dashboard chart/table frames, built once per CSV version"""
+	df = _prepare_todos_df(mtime)
+	done_mask = df["status"].to_numpy(dtype=str) == "done"
+	
+	# Hours per completion day (completed_date is NY time, day precision)
+	completed_df = df[done_mask & (df["hours_logged"].to_numpy() > 0) & df["completed_dt"].notna().to_numpy()]
+	completed_days = completed_df["completed_date"].to_numpy().astype("datetime64[D]")
+	# Sum hours per day with unique + bincount rather than an object-dtype groupby
+	days, day_idx = np.unique(completed_days, return_inverse=True)
+	hours = np.bincount(day_idx, weights=completed_df["hours_logged"].to_numpy(np.float64), minlength=len(days))
+	# Round to 1 decimal place
+	daily_hours = pd.DataFrame({"completed_date": days, "hours_logged": hours.round(1)})
+	
+	# Completed todos with both due dates and completion dates
+	completed_with_dates = df[done_mask & df["delay_days"].notna().to_numpy()].astype({"delay_days": "int64"})
+	delay_days = completed_with_dates["delay_days"]
+	delay_stats = None
+	if not completed_with_dates.empty:
+		delay_stats = (delay_days.mean(), delay_days.max(), delay_days.min())
+	
+	# Category x status counts in wide form, one column (and colour) per status
+	category_status = pd.crosstab(df["category"], df["status"]).reindex(columns=["done", "todo"], fill_value=0)
+	
+	# Completed vs estimated hours per category, only categories with some hours, largest first
+	category_hours = df.groupby("category", sort=False, observed=True).agg({
+		"hours_logged": "sum",
+		"estimated_hours": "sum"
+	}).reset_index()
+	category_hours = category_hours[
+		(category_hours["hours_logged"] > 0) | 
+		(category_hours["estimated_hours"] > 0)
+	]
+	category_hours = category_hours.assign(total_hours=category_hours["hours_logged"] + category_hours["estimated_hours"])
+	category_hours = category_hours.sort_values("total_hours", ascending=False)
+	
+	# Count on-time (delay <= 0) and missed (delay > 0) per category in one groupby pass
+	timing_analysis = (
+		completed_with_dates.assign(on_time=delay_days <= 0, missed=delay_days > 0)
+		.groupby("category", sort=False, observed=True)
+		.agg(**{
+			"Total Completed": ("delay_days", "count"),
+			"On Time": ("on_time", "sum"),
+			"Missed Deadline": ("missed", "sum"),
+		})
+		.rename_axis("Category")
+		.reset_index()
+	)
+	# Calculate on-time percentage
+	on_time_percentage = timing_analysis["On Time"] / timing_analysis["Total Completed"] * 100
+	timing_analysis["On Time %"] = on_time_percentage.map("{:.1f}%".format)
+	# Sort by total completed (descending)
+	timing_analysis = timing_analysis.sort_values("Total Completed", ascending=False)
+	
+	return {
+		"daily_hours": daily_hours,
+		"delay_stats": delay_stats,
+		"category_status": category_status,
+		"category_hours": category_hours,
+		"timing_analysis": timing_analysis,
+	}
+
+def invalidate_todos_cache() -> None:
+	"""Drop cached todos after a write, in case it landed within the same mtime tick"""
+	_cached_read_todos.clear()
+	_prepare_todos_df.clear()
+	_cached_read_all_steps.clear()
+	_dashboard_aggregates.clear()
+
+def invalidate_timetable_cache() -> None:
+	"""Drop cached timetable rows after a write"""
+	_cached_read_timetable.clear()
+
+def file_mtime(path: str) -> float:
+	"""mtime used as a cache key; 0.0 for a missing file (the reader recreates it)"""
+	try:
+		return os.path.getmtime(path)
+	except OSError:
+		return 0.0
+
+@st.cache_resource
+def _init_storage() -> bool:
+	"""Create the CSV files once per server process rather than once per session"""
 	ensure_csv_exists()
-	st.session_state.initialized = True
-    
+	return True
+
+_init_storage()
 
 st.title("Study Todo Tracker")
 
 with st.sidebar:
 	st.header("Add Todo")
-	title = st.text_input("Title", placeholder="e.g., Read Chapter 3")
-	due = st.date_input("Due date", value=get_ny_date() + timedelta(days=7))
-	est_hours = st.number_input("Estimated hours", min_value=0.0, max_value=200.0, value=2.0, step=0.5)
-	priority = st.selectbox("Priority", ["Low", "Medium", "High"], index=1)
-	steps = st.text_area("Steps (optional)", placeholder="- Step 1\n- Step 2\n- Step 3", height=100, help="Enter each step on a new line starting with '-'")
-	if st.button("Add"):
+	# A form batches the inputs so typing doesn't rerun the whole app on every change
+	with st.form("add_todo", clear_on_submit=True):
+		title = st.text_input("Title", placeholder="e.g., Read Chapter 3")
+		due = st.date_input("Due date", value=_TODAY + timedelta(days=7))
+		est_hours = st.number_input("Estimated hours", min_value=0.0, max_value=200.0, value=2.0, step=0.5)
+		priority = st.selectbox("Priority", ["Low", "Medium", "High"], index=1)
+		steps = st.text_area("Steps (optional)", placeholder="- Step 1\n- Step 2\n- Step 3", height=100, help="Enter each step on a new line starting with '-'")
+		submitted = st.form_submit_button("Add")
+	if submitted:
 		if not title.strip():
 			st.warning("Please provide a title")
 		else:
 			add_todo(title, due.isoformat(), est_hours, priority, steps)
+			invalidate_todos_cache()
 			st.success("Todo added")
 
 	st.divider()
@@ -55,10 +193,10 @@ with st.sidebar:
 		paste_csv = st.text_area("Paste CSV code", height=150, placeholder="id,title,due_date,estimated_hours,hours_logged,priority,status,steps,created_at\n,Example task,2025-10-06,1.0,0.0,Medium,todo,,", key="csv_input", value="" if st.session_state.csv_input_clear else None)
 		mode = st.radio("Import mode", ["append", "replace"], index=0, horizontal=True)
 		if st.button("Import from pasted CSV"):
-			from utils.db_utils import import_todos_csv
 			if paste_csv.strip():
 				res = import_todos_csv(paste_csv.encode("utf-8"), mode=mode)
 				if res.get("ok"):
+					invalidate_todos_cache()
 					st.success(f"Imported {res['added']} items. Total now {res['total']}.")
 					# Trigger clearing the input after successful import
 					st.session_state.csv_input_clear = True
@@ -72,235 +210,169 @@ with st.sidebar:
 		if st.session_state.csv_input_clear:
 			st.session_state.csv_input_clear = False
 
+@st.cache_data(show_spinner=False)
+def build_category_hours_fig(categories: tuple, hours_logged: tuple, estimated_hours: tuple):
+	"""Grouped bar chart of completed vs estimated hours per category, keyed on small hashable tuples"""
+	categories = list(categories)
+	fig = go.Figure()
+	
+	# Add completed hours bars
+	fig.add_trace(go.Bar(
+		name='Completed Hours',
+		x=categories,
+		y=hours_logged,
+		marker_color='#2E8B57',  # Sea green
+		text=np.round(hours_logged, 1),
+		textposition='auto',
+	))
+	
+	# Add estimated hours bars
+	fig.add_trace(go.Bar(
+		name='Estimated Hours',
+		x=categories,
+		y=estimated_hours,
+		marker_color='#FF6B6B',  # Light red
+		text=np.round(estimated_hours, 1),
+		textposition='auto',
+	))
+	
+	fig.update_layout(
+		title='Hours by Category',
+		xaxis_title='Category',
+		yaxis_title='Hours',
+		barmode='group',
+		height=400
+	)
+	return fig
+
+def render_todo_editor(todos: pd.DataFrame, key: str, action: str) -> None:
+	"""Render todos as a single editable table and apply the ticked actions in one pass"""
+	view = todos[["id", "category", "title", "due_date", "estimated_hours", "hours_logged", "priority", "completed_display"]].copy()
+	view.insert(0, action, False)
+	view["delete"] = False
+	edited = st.data_editor(
+		view,
+		width='stretch',
+		hide_index=True,
+		num_rows="fixed",
+		disabled=[c for c in view.columns if c not in (action, "delete")],
+		column_config={
+			"id": None,
+			"done": st.column_config.CheckboxColumn("✓", help="Mark as done"),
+			"reopen": st.column_config.CheckboxColumn("↶", help="Reopen todo"),
+			"category": st.column_config.TextColumn("Category"),
+			"title": st.column_config.TextColumn("Title"),
+			"due_date": st.column_config.TextColumn("Due"),
+			"estimated_hours": st.column_config.NumberColumn("Est (h)", format="%.2f"),
+			"hours_logged": st.column_config.NumberColumn("Logged (h)", format="%.2f"),
+			"priority": st.column_config.TextColumn("Priority"),
+			"completed_display": st.column_config.TextColumn("Completed") if action == "reopen" else None,
+			"delete": st.column_config.CheckboxColumn("🗑️", help="Delete todo"),
+		},
+		# Key on the CSV version so ticks never carry over onto a reloaded table
+		key=f"{key}_{todos_mtime}",
+	)
+	to_delete = edited.loc[edited["delete"], "id"].tolist()
+	to_update = edited.loc[edited[action] & ~edited["delete"], "id"].tolist()
+	if to_delete or to_update:
+		bulk_update_status(to_update, "done" if action == "done" else "todo")
+		bulk_delete(to_delete)
+		invalidate_todos_cache()
+		st.rerun()
+
 # Fetch data
-rows = read_todos()
+todos_mtime = todos_store_mtime()
+rows = _cached_read_todos(todos_mtime)
+df = _prepare_todos_df(todos_mtime) if rows else pd.DataFrame()
 
 # Tabs
 tab_dashboard, tab_todos, tab_logs, tab_timetable = st.tabs(["Dashboard", "Todos", "Log Time", "Timetable"])  # noqa: E101 tabs are aligned visually in UI
 
-with tab_todos:
+def _save_steps(todo_id: str, steps: list) -> None:
+	"""Form callback: write the ticked/unticked steps before the fragment reruns"""
+	checked = [st.session_state[f"step_{todo_id}_{step['id']}"] for step in steps]
+	changed = [(todo_id, "step", (step["id"], is_checked)) for step, is_checked in zip(steps, checked) if is_checked != bool(step.get("completed", False))]
+	if changed:
+		apply_updates(changed)
+		invalidate_todos_cache()
+		st.session_state[f"steps_saved_{todo_id}"] = True
+		# Ticking the last step auto-completes the todo, which moves it between tables
+		st.session_state[f"steps_completed_{todo_id}"] = all(checked)
+
+@st.fragment
+def render_step_checklist(todo_id: str, title: str, steps: list) -> None:
+	"""One todo's step checklist; saving reruns only this fragment unless the todo completes"""
+	if st.session_state.pop(f"steps_completed_{todo_id}", False):
+		st.rerun()
+	if st.session_state.get(f"steps_saved_{todo_id}"):
+		# Fragment reruns reuse the original arguments, so re-read once this checklist has written
+		steps = _cached_read_all_steps(todos_store_mtime(), (todo_id,)).get(todo_id, steps)
+	progress = steps_progress(steps)
+	with st.expander(f"{title}  •  {progress['completed']}/{progress['total']} ({progress['percentage']}%)", expanded=False):
+		# One checkbox per step inside a form: a single rerun on save instead of a button pair per step
+		with st.form(f"steps_{todo_id}"):
+			for step in steps:
+				st.checkbox(step.get("description", ""), value=bool(step.get("completed", False)), key=f"step_{todo_id}_{step['id']}")
+			st.form_submit_button("Save steps", on_click=_save_steps, args=(todo_id, steps))
+
+@st.fragment
+def render_todos_tab(rows: list, df: pd.DataFrame) -> None:
+	"""Missed, active and completed todo tables plus step checklists"""
 	
 	if not rows:
 		st.info("No todos yet. Add one from the sidebar.")
 	else:
-		df = pd.DataFrame(rows)
-		# Ensure completed_at column exists (for backward compatibility)
-		if "completed_at" not in df.columns:
-			df["completed_at"] = ""
-		def extract_category(title: str) -> str:
-			title_str = str(title).strip()
-			# First try to extract from dash format: "Category - Subcategory"
-			if " - " in title_str:
-				category = title_str.split(" - ")[0].strip()
-				return category if category else "Uncategorized"
-			# Second try brackets format: "Category (Subcategory)"
-			if "(" in title_str and ")" in title_str:
-				category = title_str.split("(")[0].strip()
-				return category if category else "Uncategorized"
-			# Fallback to slash format: "Category/Subcategory"
-			parts = [p.strip() for p in title_str.split("/")]
-			return parts[0] if parts and parts[0] else "Uncategorized"
-		df["category"] = df["title"].apply(extract_category)
 		# Separate active and done todos
 		active_df = df[df["status"] == "todo"]
 		done_df = df[df["status"] == "done"]
 		
 		# Check for missed todos (past due date and not completed)
-		from datetime import datetime
-		today = datetime.now().date()
-		missed_todos = []
-		active_todos = []
-		
-		if not active_df.empty:
-			for row in active_df.to_dict(orient="records"):
-				due_date = datetime.strptime(row['due_date'], '%Y-%m-%d').date()
-				if due_date < today:
-					missed_todos.append(row)
-				else:
-					active_todos.append(row)
+		today = pd.Timestamp(_TODAY)
+		# Compare against the due dates parsed once at load instead of strptime per row
+		missed_mask = active_df["due_dt"] < today
+		missed_df = active_df[missed_mask]
+		upcoming_df = active_df[~missed_mask]
 		
 		# Show missed todos first
-		if missed_todos:
+		if not missed_df.empty:
 			st.markdown("### **Missed Todos**")
-			for row in missed_todos:
-				# Get steps and progress for this todo
-				steps = get_todo_steps(row['id'])
-				progress = get_todo_progress(row['id'])
-				
-				# Format display title - if it has steps, show just subcategory, otherwise show full title
-				display_title = row['title']
-				if steps:
-					# Extract subcategory from title like "Cloud Computing (Project) - ..." -> "Project"
-					title_parts = row['title'].split('(')
-					if len(title_parts) > 1:
-						subcategory_part = title_parts[1].split(')')[0]
-						display_title = subcategory_part
-				
-				cols = st.columns([7, 2, 2, 1])
-				with cols[0]:
-					st.write(f"**{display_title}** ")
-					
-					# Show steps if they exist
-					if steps:
-						with st.expander("Steps", expanded=False):
-							for step in steps:
-								step_cols = st.columns([8, 1, 1])
-								with step_cols[0]:
-									is_completed = step.get("completed", False)
-									if is_completed:
-										# Show completed step with strikethrough
-										st.markdown(f"~~{step.get('description', '')}~~")
-									else:
-										# Show pending step normally
-										st.write(f"⭕ {step.get('description', '')}")
-								with step_cols[1]:
-									if not step.get("completed", False):
-										if st.button("✓", key=f"missed_step_done_{row['id']}_{step['id']}", help="Mark step as complete"):
-											update_todo_step(row['id'], step['id'], True)
-											st.rerun()
-								with step_cols[2]:
-									if step.get("completed", False):
-										if st.button("↶", key=f"missed_step_undo_{row['id']}_{step['id']}", help="Mark step as incomplete"):
-											update_todo_step(row['id'], step['id'], False)
-											st.rerun()
-					
-						# Show details and due date on same line
-						caption_text = f"Est {row['estimated_hours']}h  •  Logged {row['hours_logged']}h  •  Pri {row['priority']}"
-						if steps:
-							caption_text += f"  •  Steps: {progress['completed']}/{progress['total']} ({progress['percentage']}%)"
-						caption_text += f"  •  📅 Due: {row['due_date']} (OVERDUE)"
-						# Show completion timestamp if available
-						if row.get('completed_at'):
-							from datetime import datetime
-							try:
-								completed_dt = datetime.fromisoformat(row['completed_at'].replace('Z', '+00:00'))
-								completed_date = completed_dt.strftime('%Y-%m-%d %H:%M')
-								caption_text += f"  •  ✅ Completed: {completed_date}"
-							except:
-								caption_text += f"  •  ✅ Completed: {row['completed_at']}"
-						st.caption(caption_text)
-				with cols[1]:
-					if st.button("✓", key=f"missed_done_{row['id']}", help="Mark as done"):
-						update_todo_status(row["id"], "done")
-						st.rerun()
-				with cols[2]:
-					if st.button("🗑️", type="secondary", key=f"missed_del_{row['id']}", help="Delete todo"):
-						delete_todo(row["id"])
-						st.rerun()
-				with cols[3]:
-					st.write("")
+			render_todo_editor(missed_df, key="missed_editor", action="done")
 		
 		# Active todos by category
-		if active_todos:
+		if not upcoming_df.empty:
 			st.markdown("### 📋 **Active Todos**")
-			# Convert back to DataFrame for category grouping
-			active_df = pd.DataFrame(active_todos)
-			for category in active_df["category"].unique():
-				st.markdown(f"### {category}")
-				cat_rows = active_df[active_df["category"] == category].to_dict(orient="records")
-				for row in cat_rows:
-					# Get steps and progress for this todo
-					steps = get_todo_steps(row['id'])
-					progress = get_todo_progress(row['id'])
-					
-					# Format display title - if it has steps, show just subcategory, otherwise show full title
-					display_title = row['title']
-					if steps:
-						# Extract subcategory from title like "Cloud Computing (Project) - ..." -> "Project"
-						title_parts = row['title'].split('(')
-						if len(title_parts) > 1:
-							subcategory_part = title_parts[1].split(')')[0]
-							display_title = subcategory_part
-					
-					cols = st.columns([7, 2, 2, 1])
-					with cols[0]:
-						st.write(f"**{display_title}**")
-						
-						# Show steps if they exist
-						if steps:
-							with st.expander("Steps", expanded=False):
-								for step in steps:
-									step_cols = st.columns([8, 1, 1])
-									with step_cols[0]:
-										is_completed = step.get("completed", False)
-										if is_completed:
-											# Show completed step with strikethrough
-											st.markdown(f"~~{step.get('description', '')}~~")
-										else:
-											# Show pending step normally
-											st.write(f"⭕ {step.get('description', '')}")
-									with step_cols[1]:
-										if not step.get("completed", False):
-											if st.button("✓", key=f"step_done_{row['id']}_{step['id']}", help="Mark step as complete"):
-												update_todo_step(row['id'], step['id'], True)
-												st.rerun()
-									with step_cols[2]:
-										if step.get("completed", False):
-											if st.button("↶", key=f"step_undo_{row['id']}_{step['id']}", help="Mark step as incomplete"):
-												update_todo_step(row['id'], step['id'], False)
-												st.rerun()
-						
-						# Show details and due date on same line
-						caption_text = f"Est {row['estimated_hours']}h  •  Logged {row['hours_logged']}h  •  Pri {row['priority']}"
-						if steps:
-							caption_text += f"  •  Steps: {progress['completed']}/{progress['total']} ({progress['percentage']}%)"
-						caption_text += f"  •  📅 Due: {row['due_date']}"
-						# Show completion timestamp if available
-						if row.get('completed_at'):
-							from datetime import datetime
-							try:
-								completed_dt = datetime.fromisoformat(row['completed_at'].replace('Z', '+00:00'))
-								completed_date = completed_dt.strftime('%Y-%m-%d %H:%M')
-								caption_text += f"  •  ✅ Completed: {completed_date}"
-							except:
-								caption_text += f"  •  ✅ Completed: {row['completed_at']}"
-						st.caption(caption_text)
-					with cols[1]:
-						if st.button("✓", key=f"done_{row['id']}", help="Mark as done"):
-							update_todo_status(row["id"], "done")
-							st.rerun()
-					with cols[2]:
-						if st.button("🗑️", type="secondary", key=f"del_{row['id']}", help="Delete todo"):
-							delete_todo(row["id"])
-							st.rerun()
-					with cols[3]:
-						st.write("")
+			categories = sorted(upcoming_df["category"].unique())
+			selected_cat = st.selectbox("Filter category", ["All"] + categories, key="active_category_filter")
+			if selected_cat != "All":
+				upcoming_df = upcoming_df[upcoming_df["category"] == selected_cat]
+			render_todo_editor(upcoming_df.sort_values("category", kind="stable"), key="active_editor", action="done")
 		else:
 			st.info("No active todos. Great job!")
 		
+		# Steps for open todos, one page at a time so widget count stays bounded
+		open_df = pd.concat([missed_df, upcoming_df])
+		page_count = max(1, -(-len(open_df) // STEPS_PAGE_SIZE))
+		page = 1
+		if page_count > 1:
+			page = st.number_input("Steps page", min_value=1, max_value=page_count, value=1, step=1, key="steps_page")
+		page_df = open_df.iloc[(page - 1) * STEPS_PAGE_SIZE:page * STEPS_PAGE_SIZE]
+		open_todos = list(page_df[["id", "title"]].itertuples(index=False, name=None))
+		# Sorted ids so the same page/filter selection reuses the cached read whatever the row order
+		steps_by_id = _cached_read_all_steps(todos_mtime, tuple(sorted(todo_id for todo_id, _ in open_todos)))
+		open_steps = [(todo_id, title, steps_by_id[todo_id]) for todo_id, title in open_todos if todo_id in steps_by_id]
+		if open_steps:
+			st.markdown("### Steps")
+		for todo_id, title, steps in open_steps:
+			render_step_checklist(todo_id, title, steps)
+		
 		# Done todos (collapsed)
 		if not done_df.empty:
 			with st.expander(f"✅ Completed ({len(done_df)} items)", expanded=False):
-				for category in done_df["category"].unique():
-					st.markdown(f"**{category}**")
-					cat_rows = done_df[done_df["category"] == category].to_dict(orient="records")
-					for row in cat_rows:
-						cols = st.columns([7, 2, 2, 1])
-						with cols[0]:
-							st.write(f"~~{row['title']}~~")
-							caption_text = f"Due {row['due_date']}  •  Est {row['estimated_hours']}h  •  Logged {row['hours_logged']}h"
-							# Show completion timestamp if available
-							if row.get('completed_at'):
-								from datetime import datetime
-								try:
-									completed_dt = datetime.fromisoformat(row['completed_at'].replace('Z', '+00:00'))
-									completed_date = completed_dt.strftime('%Y-%m-%d %H:%M')
-									caption_text += f"  •  ✅ Completed: {completed_date}"
-								except:
-									caption_text += f"  •  ✅ Completed: {row['completed_at']}"
-							st.caption(caption_text)
-						with cols[1]:
-							if st.button("↶", key=f"reopen_{row['id']}", help="Reopen todo"):
-								update_todo_status(row["id"], "todo")
-								st.rerun()
-						with cols[2]:
-							if st.button("🗑️", type="secondary", key=f"del_done_{row['id']}", help="Delete todo"):
-								delete_todo(row["id"])
-								st.rerun()
-						with cols[3]:
-							st.write("")
+				render_todo_editor(done_df.sort_values("category", kind="stable"), key="done_editor", action="reopen")
 
-with tab_logs:
+@st.fragment
+def render_logs_tab(rows: list, df: pd.DataFrame) -> None:
+	"""Time logging form and the editable logged-hours summary"""
 	st.subheader("Log Time Against a Todo")
 	if not rows:
 		st.info("No todos to log against.")
@@ -310,31 +382,29 @@ with tab_logs:
 		if st.button("Log time"):
 			selected_id = selected[0] if isinstance(selected, tuple) else selected
 			update_todo_hours(selected_id, duration)
+			invalidate_todos_cache()
 			st.success("Time logged")
+			# Full rerun: a fragment rerun would keep the stale rows/df arguments
+			st.rerun()
 	
 	# Logged hours table
 	st.subheader("Logged Hours Summary")
 	if rows:
-		import pandas as pd
-		df_logs = pd.DataFrame(rows)
 		# Filter todos with logged hours > 0
-		df_logs["hours_logged"] = pd.to_numeric(df_logs["hours_logged"], errors='coerce').fillna(0)
-		df_with_hours = df_logs[df_logs["hours_logged"] > 0].copy()
+		df_with_hours = df[df["hours_logged"] > 0].copy()
 		
 		if not df_with_hours.empty:
-			# Sort by hours logged (descending)
-			df_with_hours = df_with_hours.sort_values("hours_logged", ascending=False)
-			
-			# Ensure completed_at column exists (for backward compatibility)
-			if "completed_at" not in df_with_hours.columns:
-				df_with_hours["completed_at"] = ""
+			# Top todos by hours logged (descending); nlargest avoids a full sort and caps the table size
+			top_hours = df_with_hours.nlargest(HOURS_SUMMARY_LIMIT, "hours_logged")
+			if len(df_with_hours) > HOURS_SUMMARY_LIMIT:
+				st.caption(f"Showing the top {HOURS_SUMMARY_LIMIT} of {len(df_with_hours)} todos by hours logged")
 			
 			# Show relevant columns
 			display_cols = ["title", "hours_logged", "estimated_hours", "status", "due_date", "completed_at"]
 			
 			# Create editable dataframe
 			edited_df = st.data_editor(
-				df_with_hours[display_cols], 
+				top_hours[display_cols], 
 				width='stretch',
 				num_rows="fixed",
 				column_config={
@@ -349,50 +419,33 @@ with tab_logs:
 			)
 			
 			# Check if data was changed and update accordingly
-			if not edited_df.equals(df_with_hours[display_cols]):
-				# Find changes and update the database
-				from utils.db_utils import update_todo_hours, update_todo_status, update_todo_estimated_hours, update_todo_due_date, update_todo_completed_at
-				
-				# Get the original data with IDs and reset index for proper alignment
-				original_data = df_with_hours[["id"] + display_cols].copy().reset_index(drop=True)
-				edited_data = edited_df.copy().reset_index(drop=True)
-				edited_data["id"] = original_data["id"]  # Add ID column to edited data
-				
-				# Compare and update changes by iterating through both DataFrames
-				for idx in range(len(original_data)):
-					if idx < len(edited_data):
-						original_row = original_data.iloc[idx]
-						edited_row = edited_data.iloc[idx]
-						todo_id = original_row["id"]
-						
-						# Check hours_logged changes
-						if edited_row["hours_logged"] != original_row["hours_logged"]:
-							# Calculate the difference
-							hours_diff = edited_row["hours_logged"] - original_row["hours_logged"]
-							update_todo_hours(todo_id, hours_diff)
-						
-						# Check estimated_hours changes
-						if edited_row["estimated_hours"] != original_row["estimated_hours"]:
-							update_todo_estimated_hours(todo_id, edited_row["estimated_hours"])
-						
-						# Check status changes
-						if edited_row["status"] != original_row["status"]:
-							update_todo_status(todo_id, edited_row["status"])
-						
-						# Check due_date changes
-						if str(edited_row["due_date"]) != str(original_row["due_date"]):
-							update_todo_due_date(todo_id, edited_row["due_date"])
-						
-						# Check completed_at changes
-						if str(edited_row["completed_at"]) != str(original_row["completed_at"]):
-							update_todo_completed_at(todo_id, edited_row["completed_at"])
+			if not edited_df.equals(top_hours[display_cols]):
+				# Diff column-wise and only touch the (usually one) changed cells
+				original_data = top_hours[display_cols].reset_index(drop=True)
+				edited_data = edited_df.reset_index(drop=True)
+				ids = top_hours["id"].reset_index(drop=True)
+				pending = []
+				for col in ("hours_logged", "estimated_hours", "status", "due_date", "completed_at"):
+					if col in ("due_date", "completed_at"):
+						changed = edited_data[col].astype(str).ne(original_data[col].astype(str))
+					else:
+						changed = edited_data[col].ne(original_data[col])
+					for idx in np.flatnonzero(changed.to_numpy()):
+						value = edited_data[col].iat[idx]
+						if col == "hours_logged":
+							# Hours are logged as a delta against the stored value
+							value = value - original_data[col].iat[idx]
+						pending.append((ids.iat[idx], col, value))
+				# All edits land in one CSV rewrite
+				apply_updates(pending)
 				
+				invalidate_todos_cache()
 				st.success("Changes saved!")
 				st.rerun()
 			
 			# Total hours summary
 			total_logged = df_with_hours["hours_logged"].sum()
-			total_estimated = df_logs["estimated_hours"].astype(float).sum()
+			total_estimated = df["estimated_hours"].sum()
 			col1, col2, col3 = st.columns(3)
 			with col1:
 				st.metric("Total Hours Logged", f"{total_logged:.1f}")
@@ -406,22 +459,21 @@ with tab_logs:
 	else:
 		st.info("No todos to display.")
 
-with tab_dashboard:
+@st.fragment
+def render_dashboard_tab(rows: list, df: pd.DataFrame) -> None:
+	"""KPIs, charts and category timing analysis"""
 	st.subheader("Overview")
 	
-	# Always fetch fresh data for dashboard to reflect latest state
-	rows_db = read_todos()
-
 	# KPIs
-	if rows_db:
-		import pandas as pd
-		df = pd.DataFrame(rows_db)
-		# Ensure completed_at column exists (for backward compatibility)
-		if "completed_at" not in df.columns:
-			df["completed_at"] = ""
-		completed = len(df[df["status"] == "done"])
-		remaining = len(df[df["status"] == "todo"])
-		overdue = len(df[(df["status"] == "todo") & (pd.to_datetime(df["due_date"]) < pd.to_datetime(get_ny_date()))])
+	if rows:
+		# Status masks computed once on plain arrays; due_dt is parsed at load (NaT never compares as overdue)
+		status = df["status"].to_numpy(dtype=str)
+		done_mask = status == "done"
+		todo_mask = status == "todo"
+		overdue_mask = todo_mask & (df["due_dt"].to_numpy() < np.datetime64(_TODAY))
+		completed = int(done_mask.sum())
+		remaining = int(todo_mask.sum())
+		overdue = int(overdue_mask.sum())
 		
 		col1, col2, col3, col4 = st.columns(4)
 		with col1:
@@ -435,291 +487,88 @@ with tab_dashboard:
 	
 	# Charts
 	# Hours logged per day (line chart)
-	if rows_db:
-		import plotly.express as px
-		# Convert hours_logged to numeric to avoid string concatenation
-		df["hours_logged"] = pd.to_numeric(df["hours_logged"], errors='coerce').fillna(0)
-		
-		# Filter for completed todos with completion dates and logged hours
-		completed_df = df[(df["status"] == "done") & (df["hours_logged"] > 0) & (df["completed_at"].notna()) & (df["completed_at"] != "")]
-		
-		if not completed_df.empty:
-			# Convert completed_at to date (handle mixed formats + timezone)
-			completed_df["completed_date"] = (
-				pd.to_datetime(completed_df["completed_at"], errors="coerce", utc=True)
-				.dt.tz_convert(NY_TZ)
-				.dt.tz_localize(None)
-				.dt.date
-			)
-			daily_hours = completed_df.groupby("completed_date")["hours_logged"].sum().reset_index()
-			
-			# Round to 1 decimal place
-			daily_hours["hours_logged"] = daily_hours["hours_logged"].round(1)
-			hours_fig = px.line(daily_hours, x="completed_date", y="hours_logged", 
-							   title="Hours Logged Per Day (By Completion Date)", markers=True)
-			# Format x-axis to show dates only
-			hours_fig.update_xaxes(tickformat="%Y-%m-%d")
-			st.plotly_chart(hours_fig, width='stretch', config={'displayModeBar': True, 'showLink': False})
-		else:
-			st.info("Complete some todos with logged hours to see daily progress")
-	else:
+	if not rows:
 		st.info("Add todos to see daily hours")
+		st.subheader("Additional Insights")
+		col1, col2 = st.columns(2)
+		with col1:
+			st.info("Add todos to see completion status")
+		with col2:
+			st.info("Add todos to see category hours")
+		st.subheader("Category Timing Analysis")
+		st.info("Add todos to see category timing analysis")
+		return
+	
+	# Aggregates are cached per CSV version, so revisiting the tab only redraws
+	agg = _dashboard_aggregates(todos_mtime)
+	daily_hours = agg["daily_hours"]
+	if not daily_hours.empty:
+		# Native Vega-Lite chart: much smaller payload than a Plotly figure
+		st.markdown("#### Hours Logged Per Day (By Completion Date)")
+		st.line_chart(daily_hours.set_index("completed_date")["hours_logged"], x_label="Completed", y_label="Hours")
+	else:
+		st.info("Complete some todos with logged hours to see daily progress")
 	
 	# Additional insights
 	st.subheader("Additional Insights")
 	
-	# Late completion trends chart
-	if rows_db:
-		import plotly.express as px
-		import plotly.graph_objects as go
-		
-		# Filter for completed todos with both due dates and completion dates
-		completed_with_dates = df[(df["status"] == "done") & (df["completed_at"].notna()) & (df["completed_at"] != "") & (df["due_date"].notna()) & (df["due_date"] != "")]
-		
-		if not completed_with_dates.empty:
-			# Convert dates (robust to mixed formats and timezones)
-			completed_with_dates["due_date_parsed"] = pd.to_datetime(
-				completed_with_dates["due_date"], errors="coerce"
-			)
-			completed_with_dates["completed_date_parsed"] = pd.to_datetime(
-				completed_with_dates["completed_at"], errors="coerce", utc=True
-			).dt.tz_convert(NY_TZ).dt.tz_localize(None)
-			
-			# Drop rows where dates couldn't be parsed
-			completed_with_dates = completed_with_dates.dropna(subset=["due_date_parsed", "completed_date_parsed"]).copy()
-			# Calculate delay in days
-			completed_with_dates["delay_days"] = (completed_with_dates["completed_date_parsed"] - completed_with_dates["due_date_parsed"]).dt.days
-			
-			# Group by delay category
-			delay_categories = []
-			delay_counts = []
-			
-			# Early completion (negative delay)
-			early = len(completed_with_dates[completed_with_dates["delay_days"] < 0])
-			if early > 0:
-				delay_categories.append("Early")
-				delay_counts.append(early)
-			
-			# On time (0 delay)
-			on_time = len(completed_with_dates[completed_with_dates["delay_days"] == 0])
-			if on_time > 0:
-				delay_categories.append("On Time")
-				delay_counts.append(on_time)
-			
-			# Late (positive delay)
-			late = len(completed_with_dates[completed_with_dates["delay_days"] > 0])
-			if late > 0:
-				delay_categories.append("Late")
-				delay_counts.append(late)
-			
-			if delay_categories:
-				# Show delay statistics
-				avg_delay = completed_with_dates["delay_days"].mean()
-				max_delay = completed_with_dates["delay_days"].max()
-				min_delay = completed_with_dates["delay_days"].min()
-				
-				st.caption(f"Average delay: {avg_delay:.1f} days | Max delay: {max_delay} days | Earliest completion: {min_delay} days before due")
-			else:
-				st.info("Complete some todos to see timing trends")
-		else:
-			st.info("Complete some todos to see timing trends")
+	# Late completion trends
+	if agg["delay_stats"] is not None:
+		avg_delay, max_delay, min_delay = agg["delay_stats"]
+		st.caption(f"Average delay: {avg_delay:.1f} days | Max delay: {max_delay} days | Earliest completion: {min_delay} days before due")
+	else:
+		st.info("Complete some todos to see timing trends")
 	
 	col1, col2 = st.columns(2)
 	with col1:
 		# Completed vs Uncompleted by category bar chart
-		if rows_db:
-			import plotly.express as px
-			def extract_category(title: str) -> str:
-				title_str = str(title).strip()
-				# First try to extract from dash format: "Category - Subcategory"
-				if " - " in title_str:
-					category = title_str.split(" - ")[0].strip()
-					return category if category else "Uncategorized"
-				# Second try brackets format: "Category (Subcategory)"
-				if "(" in title_str and ")" in title_str:
-					category = title_str.split("(")[0].strip()
-					return category if category else "Uncategorized"
-				# Fallback to slash format: "Category/Subcategory"
-				parts = [p.strip() for p in title_str.split("/")]
-				return parts[0] if parts and parts[0] else "Uncategorized"
-			df["category"] = df["title"].apply(extract_category)
-			
-			# Group by category and status
-			category_status = df.groupby(["category", "status"]).size().reset_index(name="count")
-			status_fig = px.bar(category_status, x="category", y="count", color="status",
-							   title="Completed vs Uncompleted by Category")
-			# Update colors manually to avoid deprecation warnings
-			status_fig.for_each_trace(lambda trace: trace.update(marker_color='green' if trace.name == 'done' else 'orange'))
-			st.plotly_chart(status_fig, width='stretch', config={'displayModeBar': True, 'showLink': False})
-		else:
-			st.info("Add todos to see completion status")
+		st.markdown("#### Completed vs Uncompleted by Category")
+		st.bar_chart(agg["category_status"], x_label="Category", y_label="Count", color=["#008000", "#FFA500"])
 	
 	with col2:
 		# Completed vs Estimated hours per category (grouped bar chart)
-		if rows_db:
-			import plotly.express as px
-			import plotly.graph_objects as go
-			def extract_category(title: str) -> str:
-				title_str = str(title).strip()
-				# First try to extract from dash format: "Category - Subcategory"
-				if " - " in title_str:
-					category = title_str.split(" - ")[0].strip()
-					return category if category else "Uncategorized"
-				# Second try brackets format: "Category (Subcategory)"
-				if "(" in title_str and ")" in title_str:
-					category = title_str.split("(")[0].strip()
-					return category if category else "Uncategorized"
-				# Fallback to slash format: "Category/Subcategory"
-				parts = [p.strip() for p in title_str.split("/")]
-				return parts[0] if parts and parts[0] else "Uncategorized"
-			df["category"] = df["title"].apply(extract_category)
-			# Convert hours to numeric
-			df["hours_logged"] = pd.to_numeric(df["hours_logged"], errors='coerce').fillna(0)
-			df["estimated_hours"] = pd.to_numeric(df["estimated_hours"], errors='coerce').fillna(0)
-			
-			# Group by category and sum both hours
-			category_hours = df.groupby("category").agg({
-				"hours_logged": "sum",
-				"estimated_hours": "sum"
-			}).reset_index()
-			
-			# Only show categories with either logged or estimated hours
-			category_hours = category_hours[
-				(category_hours["hours_logged"] > 0) | 
-				(category_hours["estimated_hours"] > 0)
-			]
-			
-			if not category_hours.empty:
-				# Sort by total hours (logged + estimated)
-				category_hours["total_hours"] = category_hours["hours_logged"] + category_hours["estimated_hours"]
-				category_hours = category_hours.sort_values("total_hours", ascending=False)
-				
-				# Create grouped bar chart
-				fig = go.Figure()
-				
-				# Add completed hours bars
-				fig.add_trace(go.Bar(
-					name='Completed Hours',
-					x=category_hours['category'],
-					y=category_hours['hours_logged'],
-					marker_color='#2E8B57',  # Sea green
-					text=category_hours['hours_logged'].round(1),
-					textposition='auto',
-				))
-				
-				# Add estimated hours bars
-				fig.add_trace(go.Bar(
-					name='Estimated Hours',
-					x=category_hours['category'],
-					y=category_hours['estimated_hours'],
-					marker_color='#FF6B6B',  # Light red
-					text=category_hours['estimated_hours'].round(1),
-					textposition='auto',
-				))
-				
-				fig.update_layout(
-					title='Hours by Category',
-					xaxis_title='Category',
-					yaxis_title='Hours',
-					barmode='group',
-					height=400
-				)
-				
-				st.plotly_chart(fig, width='stretch', config={'displayModeBar': True, 'showLink': False})
-			else:
-				st.info("Add todos with hours to see category breakdown")
+		category_hours = agg["category_hours"]
+		if not category_hours.empty:
+			hours_fig = build_category_hours_fig(
+				tuple(category_hours["category"].astype(str)),
+				tuple(category_hours["hours_logged"]),
+				tuple(category_hours["estimated_hours"]),
+			)
+			st.plotly_chart(hours_fig, width='stretch', config={'displayModeBar': True, 'showLink': False})
 		else:
-			st.info("Add todos to see category hours")
+			st.info("Add todos with hours to see category breakdown")
 
 	st.subheader("Category Timing Analysis")
 	
-	# Create category timing analysis table
-	if rows_db:
-		# Filter for completed todos with both due dates and completion dates
-		completed_with_dates = df[(df["status"] == "done") & (df["completed_at"].notna()) & (df["completed_at"] != "") & (df["due_date"].notna()) & (df["due_date"] != "")]
-		
-		if not completed_with_dates.empty:
-			# Convert dates (robust to mixed formats and timezones)
-			completed_with_dates["due_date_parsed"] = pd.to_datetime(
-				completed_with_dates["due_date"], errors="coerce"
-			)
-			completed_with_dates["completed_date_parsed"] = pd.to_datetime(
-				completed_with_dates["completed_at"], errors="coerce", utc=True
-			).dt.tz_convert(NY_TZ).dt.tz_localize(None)
-			
-			# Drop rows where dates couldn't be parsed
-			completed_with_dates = completed_with_dates.dropna(subset=["due_date_parsed", "completed_date_parsed"]).copy()
-			# Calculate delay in days
-			completed_with_dates["delay_days"] = (completed_with_dates["completed_date_parsed"] - completed_with_dates["due_date_parsed"]).dt.days
-			
-			# Add category information
-			def extract_category(title: str) -> str:
-				title_str = str(title).strip()
-				# First try to extract from dash format: "Category - Subcategory"
-				if " - " in title_str:
-					category = title_str.split(" - ")[0].strip()
-					return category if category else "Uncategorized"
-				# Second try brackets format: "Category (Subcategory)"
-				if "(" in title_str and ")" in title_str:
-					category = title_str.split("(")[0].strip()
-					return category if category else "Uncategorized"
-				# Fallback to slash format: "Category/Subcategory"
-				parts = [p.strip() for p in title_str.split("/")]
-				return parts[0] if parts and parts[0] else "Uncategorized"
-			
-			completed_with_dates["category"] = completed_with_dates["title"].apply(extract_category)
-			
-			# Create timing analysis
-			timing_analysis = []
-			for category in completed_with_dates["category"].unique():
-				category_data = completed_with_dates[completed_with_dates["category"] == category]
-				# Ensure we only count rows with a valid delay value
-				category_data = category_data[category_data["delay_days"].notna()]
-				
-				# Count on-time (delay <= 0) and missed (delay > 0)
-				on_time_count = len(category_data[category_data["delay_days"] <= 0])
-				missed_count = len(category_data[category_data["delay_days"] > 0])
-				total_count = len(category_data)
-				
-				# Calculate on-time percentage
-				on_time_percentage = (on_time_count / total_count * 100) if total_count > 0 else 0
-				
-				timing_analysis.append({
-					"Category": category,
-					"Total Completed": total_count,
-					"On Time": on_time_count,
-					"Missed Deadline": missed_count,
-					"On Time %": f"{on_time_percentage:.1f}%"
-				})
-			
-			# Sort by total completed (descending)
-			timing_analysis_df = pd.DataFrame(timing_analysis).sort_values("Total Completed", ascending=False)
-			
-			# Display the table
-			st.dataframe(timing_analysis_df, use_container_width=True)
-			
-		else:
-			st.info("Complete some todos with due dates to see category timing analysis")
+	# Category timing analysis table
+	timing_analysis_df = agg["timing_analysis"]
+	if not timing_analysis_df.empty:
+		st.dataframe(timing_analysis_df, use_container_width=True)
 	else:
-		st.info("Add todos to see category timing analysis")
+		st.info("Complete some todos with due dates to see category timing analysis")
 
-with tab_timetable:
+@st.fragment
+def render_timetable_tab() -> None:
+	"""Today's focus and the editable weekly timetable"""
 	st.subheader("Weekly Timetable")
-	from utils.db_utils import read_timetable, seed_timetable_from_csv
 	if st.button("Preload from data/Timetablev1.csv"):
-		res = seed_timetable_from_csv("data/Timetablev1.csv")
+		preload_path = "data/Timetablev1.csv"
+		if os.path.exists(preload_path):
+			res = _cached_load_timetable_csv(preload_path, os.path.getmtime(preload_path))
+		else:
+			res = {"ok": False, "error": f"File not found: {preload_path}"}
 		if res.get("ok"):
-			st.success(f"Loaded {res['added']} rows from Timetablev1.csv")
+			write_timetable(res["rows"])
+			invalidate_timetable_cache()
+			st.success(f"Loaded {len(res['rows'])} rows from Timetablev1.csv")
 			st.rerun()
 		else:
 			st.error(res.get("error", "Preload failed"))
-	rows_tt = read_timetable()
+	rows_tt = _cached_read_timetable(file_mtime(TIMETABLE_CSV_PATH))
 	if rows_tt:
-		import pandas as pd
 		df_view = pd.DataFrame(rows_tt)[["day","start_time","end_time","activity","focus"]]
 		# Today's Focus
-		from datetime import date as _date
-		today_name = get_ny_date().strftime("%A")
+		today_name = _TODAY.strftime("%A")
 		st.subheader(f"Today's Focus — {today_name}")
 		df_today = df_view[df_view["day"] == today_name].copy()
 		if df_today.empty:
@@ -743,22 +592,29 @@ with tab_timetable:
 				"focus": st.column_config.TextColumn("Focus"),
 			},
 		)
-		from utils.db_utils import write_timetable, generate_ulid, read_timetable as _read_tt
 		if st.button("Save timetable changes"):
-			existing = _read_tt()
-			new_rows = []
-			for i, r in edited_df.iterrows():
-				row_id = existing[i]["id"] if i < len(existing) else generate_ulid()
-				new_rows.append({
-					"id": row_id,
-					"day": str(r.get("day") or "").strip(),
-					"start_time": str(r.get("start_time") or "").strip(),
-					"end_time": str(r.get("end_time") or "").strip(),
-					"activity": str(r.get("activity") or "").strip(),
-					"focus": str(r.get("focus") or "").strip(),
-				})
+			existing_ids = [r["id"] for r in read_timetable()]
+			# Index labels map edited rows back to existing ids; added rows get fresh ids
+			ids = [existing_ids[i] if isinstance(i, int) and i < len(existing_ids) else generate_ulid() for i in edited_df.index]
+			fields = ["day", "start_time", "end_time", "activity", "focus"]
+			cols = {c: edited_df[c].fillna("").astype(str).str.strip().tolist() for c in fields}
+			new_rows = [dict(zip(["id"] + fields, values)) for values in zip(ids, *(cols[c] for c in fields))]
 			write_timetable(new_rows)
+			invalidate_timetable_cache()
 			st.success("Timetable saved")
 			st.rerun()
 	else:
 		st.info("Click 'Preload from data/Timetablev1.csv' to load your timetable.")
+
+# Each tab is a fragment, so widget clicks inside one tab rerun only that tab
+with tab_dashboard:
+	render_dashboard_tab(rows, df)
+
+with tab_todos:
+	render_todos_tab(rows, df)
+
+with tab_logs:
+	render_logs_tab(rows, df)
+
+with tab_timetable:
+	render_timetable_tab()
@@ -0,0 +1,20 @@
+from __future__ import annotations
+import pandas as pd
+
+
+def extract_category(titles: pd.Series) -> pd.Series:
+	"""Category prefix of each title, using vectorized string ops instead of a per-row apply"""
+	title_str = titles.fillna("").astype(str).str.strip()
+	# First try to extract from dash format: "Category - Subcategory"
+	dash = title_str.str.contains(" - ", regex=False)
+	# Second try brackets format: "Category (Subcategory)"
+	brackets = ~dash & title_str.str.contains("(", regex=False) & title_str.str.contains(")", regex=False)
+	# Fallback to slash format: "Category/Subcategory"
+	slash = ~dash & ~brackets
+	# Split each subset only on its own separator rather than splitting every title three times
+	category = title_str.copy()
+	category[dash] = title_str[dash].str.split(" - ", n=1).str[0]
+	category[brackets] = title_str[brackets].str.split("(", n=1).str[0]
+	category[slash] = title_str[slash].str.split("/", n=1).str[0]
+	category = category.str.strip()
+	return category.mask(category == "", "Uncategorized")
@@ -1,14 +1,32 @@
 from __future__ import annotations
 from typing import List, Dict, Any
+import numpy as np
 import pandas as pd
-import plotly.express as px
+
+
+_STATUS_DTYPE = pd.CategoricalDtype(["todo", "done"])
+_PRIORITY_DTYPE = pd.CategoricalDtype(["Low", "Medium", "High"], ordered=True)
+
+
+def _to_analytics_df(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+	"""DataFrame of rows with status/priority as categoricals (unexpected values get extra categories)."""
+	df = pd.DataFrame(rows)
+	for name, dtype in (("status", _STATUS_DTYPE), ("priority", _PRIORITY_DTYPE)):
+		if name in df.columns:
+			values = df[name].fillna("").astype(str)
+			extra = sorted(set(values.unique()) - set(dtype.categories))
+			df[name] = pd.Categorical(values, categories=[*dtype.categories, *extra], ordered=dtype.ordered)
+	return df
 
 
 def tasks_by_status_chart(rows: List[Dict[str, Any]]):
 	if not rows:
 		return None
-	df = pd.DataFrame(rows)
-	counts = df.groupby("status")["id"].count().reset_index(name="count")
+	import plotly.express as px
+	df = _to_analytics_df(rows)
+	# Counted on the category codes; slices keep the fixed category order
+	counts = df["status"].value_counts(sort=False).rename_axis("status").reset_index(name="count")
+	counts = counts[counts["count"] > 0]
 	fig = px.pie(counts, names="status", values="count", title="Tasks by status")
 	fig.update_layout(legend_title_text="Status")
 	return fig
@@ -17,7 +35,7 @@ def tasks_by_status_chart(rows: List[Dict[str, Any]]):
 def upcoming_deadlines_table(rows: List[Dict[str, Any]]):
 	if not rows:
 		return None
-	df = pd.DataFrame(rows)
+	df = _to_analytics_df(rows)
 	if "due_date" in df.columns:
 		df = df.sort_values("due_date")
 	return df[["title", "due_date", "priority", "status", "estimated_hours", "hours_logged"]]
@@ -34,9 +52,16 @@ def tasks_risk_dataframe(rows: List[Dict[str, Any]], today) -> pd.DataFrame:
 		return pd.DataFrame(columns=["title", "due_date", "remaining_h", "risk"])
 	df = pd.DataFrame(rows)
 	df["remaining_h"] = (
-		df["estimated_hours"].astype(float).fillna(0.0)
-		- df["hours_logged"].astype(float).fillna(0.0)
+		pd.to_numeric(df["estimated_hours"], errors="coerce").fillna(0.0)
+		- pd.to_numeric(df["hours_logged"], errors="coerce").fillna(0.0)
 	).clip(lower=0.0)
-	df["days_until_due"] = (pd.to_datetime(df["due_date"]) - pd.to_datetime(today)).dt.days.clip(lower=0)
-	df["risk"] = df.apply(lambda r: risk_score(r.to_dict(), r["days_until_due"]), axis=1)
+	# Day-precision ufunc arithmetic; NaT (unparseable due date) maps to 0 days, i.e. no time left
+	due = pd.to_datetime(df["due_date"], format="%Y-%m-%d", errors="coerce", cache=True).to_numpy().astype("datetime64[D]")
+	days = (due - np.datetime64(today, "D")).astype("int64")
+	df["days_until_due"] = np.where(np.isnat(due), 0, days.clip(min=0))
+	# Same formula as risk_score, on whole columns
+	daily_capacity_hours = 2.0
+	available = df["days_until_due"].to_numpy(dtype=np.float64) * daily_capacity_hours
+	remaining = df["remaining_h"].to_numpy(dtype=np.float64)
+	df["risk"] = np.divide(remaining, available, out=np.full_like(remaining, np.inf), where=available > 0)
 	return df[["title", "due_date", "remaining_h", "risk"]].sort_values(["risk", "due_date"], ascending=[False, True])
@@ -1,10 +1,22 @@
+import atexit
 import csv
+import hashlib
+import json
 import os
+import re
+import secrets
+import sys
+import tempfile
+import threading
+import time
+import warnings
 from datetime import datetime
 from datetime import date as _date
-from typing import List, Dict, Any
-import pytz
-from dateutil import parser as dtparser
+from functools import lru_cache
+from io import BytesIO, StringIO
+from typing import List, Dict, Any, Optional
+from zoneinfo import ZoneInfo
+import pandas as pd
 
 # Robust ULID generator with fallback
 try:
@@ -12,9 +24,60 @@ try:
 	def generate_ulid() -> str:
 		return str(_ulid.new())
 except Exception:  # pragma: no cover
-	import uuid as _uuid
+	# Without ulid-py, encode ULIDs ourselves so ids keep one format across single and bulk paths
 	def generate_ulid() -> str:
-		return _uuid.uuid4().hex
+		return next(_ulid_iter())
+
+_NY_TZ: Optional[ZoneInfo] = None
+
+
+def _ny_tz() -> ZoneInfo:
+	"""America/New_York, constructed on first use."""
+	global _NY_TZ
+	if _NY_TZ is None:
+		_NY_TZ = ZoneInfo("America/New_York")
+	return _NY_TZ
+
+
+# (UTC offset in seconds, end of the UTC hour it was computed for); DST only changes on the hour
+_NY_OFFSET = (0, 0.0)
+
+
+def _today_ny_iso() -> str:
+	"""Today's date in New York as YYYY-MM-DD, from time.time() and a per-hour cached UTC offset."""
+	global _NY_OFFSET
+	t = time.time()
+	if t >= _NY_OFFSET[1]:
+		offset = datetime.fromtimestamp(t, _ny_tz()).utcoffset()
+		_NY_OFFSET = (int(offset.total_seconds()), t - t % 3600 + 3600)
+	tm = time.gmtime(t + _NY_OFFSET[0])
+	return f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}"
+
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# Every 10-bit value as its two Crockford characters, so a 128-bit ULID encodes in 13 lookups
+_CROCKFORD_PAIRS = [_CROCKFORD[i >> 5] + _CROCKFORD[i & 31] for i in range(1024)]
+_PAIR_SHIFTS = range(120, -1, -10)
+_RANDOM_MASK = (1 << 80) - 1
+
+
+def _ulid_iter():
+	"""Yield ULIDs for a bulk insert: one timestamp and one random draw, incremented per id.
+
+	Ids from the same batch stay unique and sort in insertion order (monotonic ULIDs).
+	"""
+	ts = int(time.time() * 1000) << 80
+	rand = int.from_bytes(secrets.token_bytes(10), "big")
+	while True:
+		value = ts | rand
+		yield "".join([_CROCKFORD_PAIRS[(value >> shift) & 1023] for shift in _PAIR_SHIFTS])
+		rand = (rand + 1) & _RANDOM_MASK
+
+
+def _ulid_batch(n: int) -> List[str]:
+	"""Return n ULIDs generated in one go (see _ulid_iter)."""
+	ids = _ulid_iter()
+	return [next(ids) for _ in range(n)]
 
 CSV_HEADERS = [
 	"id",
@@ -28,9 +91,20 @@ CSV_HEADERS = [
 	"created_at",
 	"completed_at",
 ]
+# Numeric columns: floats in memory, written as 2-decimal strings
+HOURS_FIELDS = ("estimated_hours", "hours_logged")
+_EST_COL = CSV_HEADERS.index("estimated_hours")
+_LOGGED_COL = CSV_HEADERS.index("hours_logged")
 
 CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "todos.csv")
 TIMETABLE_CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "timetable.csv")
+# Append-only log of single-todo changes since the last full CSV rewrite
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "todos.journal")
+# Fold the journal back into the CSV after this many entries
+JOURNAL_FLUSH_EVERY = 50
+# Working store for todos: "csv" (default, hand-editable) or "parquet" (columnar snapshot, CSV kept for import/export)
+STORAGE_FORMAT = os.environ.get("STUDYTRACKER_STORAGE", "csv").strip().lower()
+PARQUET_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "todos.parquet")
 TIMETABLE_HEADERS = [
 	"id",
 	"day",            # Monday..Sunday
@@ -39,9 +113,20 @@ TIMETABLE_HEADERS = [
 	"activity",
 	"focus",
 ]
+# Canonical (interned) values for the fixed-vocabulary fields, keyed by lowercase input
+_PRIORITIES = {p.lower(): sys.intern(p) for p in ("Low", "Medium", "High")}
+_STATUSES = {s: sys.intern(s) for s in ("todo", "done")}
+_DAYS = {d.lower(): sys.intern(d) for d in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")}
+
+
+# Set once ensure_csv_exists() has run; _stat_key() clears it if a file disappears later
+_ENSURED = False
 
 
 def ensure_csv_exists() -> None:
+	global _ENSURED
+	if _ENSURED:
+		return
 	os.makedirs(os.path.dirname(CSV_PATH), exist_ok=True)
 	if not os.path.exists(CSV_PATH) or os.path.getsize(CSV_PATH) == 0:
 		with open(CSV_PATH, mode="w", newline="") as f:
@@ -52,42 +137,319 @@ def ensure_csv_exists() -> None:
 		with open(TIMETABLE_CSV_PATH, mode="w", newline="") as f:
 			writer = csv.DictWriter(f, fieldnames=TIMETABLE_HEADERS)
 			writer.writeheader()
+	_ENSURED = True
 
 
-def read_todos() -> List[Dict[str, Any]]:
+# In-memory todos (CSV order) plus an id index, loaded lazily from the CSV and the journal
+_TODOS: Optional[List[Dict[str, Any]]] = None
+_TODO_INDEX: Dict[str, Dict[str, Any]] = {}
+_JOURNAL_ENTRIES = 0
+_TODOS_LOCK = threading.RLock()
+# (st_mtime_ns, st_size) of todos.csv when it was last loaded or flushed, to spot external edits
+_TODOS_STAT = None
+# Parsed timetable keyed by the same stat signature
+_TIMETABLE_CACHE = None
+# Exported CSV bytes per path, keyed by stat signature
+_EXPORT_CACHE: Dict[str, Any] = {}
+# (blake2b digest, stat signature) of the last snapshot written per path, to skip rewriting identical content
+_WRITE_DIGESTS: Dict[str, Any] = {}
+
+
+def _stat_key(path: str):
+	global _ENSURED
+	try:
+		st = os.stat(path)
+	except FileNotFoundError:
+		# Deleted since the first ensure_csv_exists(): recreate it with headers
+		_ENSURED = False
+		ensure_csv_exists()
+		st = os.stat(path)
+	return (st.st_mtime_ns, st.st_size)
+
+
+def _row_matrix(headers: List[str], rows: List[Dict[str, Any]]) -> List[List[Any]]:
+	"""Arrange dict rows as lists in header order, for csv.writer."""
+	return [[r.get(h, "") for h in headers] for r in rows]
+
+
+def _atomic_write_csv(path: str, headers: List[str], rows: List[Dict[str, Any]]) -> None:
+	"""Write dict rows to path atomically (see _atomic_write_matrix)."""
+	_atomic_write_matrix(path, headers, _row_matrix(headers, rows))
+
+
+def _atomic_write_matrix(path: str, headers: List[str], matrix) -> None:
+	"""Write rows already in header order to path as CSV, atomically (see _atomic_write_bytes)."""
+	sio = StringIO()
+	writer = csv.writer(sio)
+	writer.writerow(headers)
+	writer.writerows(matrix)
+	_atomic_write_bytes(path, sio.getvalue().encode("utf-8"))
+
+
+def _atomic_write_bytes(path: str, data: bytes) -> None:
+	"""Write data to a temp file in the same directory, fsync it, then os.replace it over path.
+
+	Skipped when data matches what this process last wrote to path and the file is untouched since.
+	"""
+	digest = hashlib.blake2b(data, digest_size=16).digest()
+	last = _WRITE_DIGESTS.get(path)
+	if last is not None and last[0] == digest and os.path.exists(path) and _stat_key(path) == last[1]:
+		return
+	fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+	try:
+		with os.fdopen(fd, mode="wb") as f:
+			f.write(data)
+			# Data on disk before the rename, so a crash leaves the old file or the new one, never a torn one
+			f.flush()
+			os.fsync(f.fileno())
+		# mkstemp creates 0600 files; keep the permissions of the file being replaced
+		os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+		os.replace(tmp_path, path)
+	except BaseException:
+		os.remove(tmp_path)
+		raise
+	_WRITE_DIGESTS[path] = (digest, _stat_key(path))
+
+
+def _append_csv(path: str, headers: List[str], matrix) -> None:
+	"""Append rows already in header order to the end of an existing CSV, without rewriting it."""
+	size = os.path.getsize(path)
+	with open(path, mode="a", newline="", buffering=1 << 20) as f:
+		writer = csv.writer(f)
+		if size == 0:
+			writer.writerow(headers)
+		else:
+			with open(path, mode="rb") as tail:
+				tail.seek(size - 1)
+				if tail.read(1) != b"\n":
+					# Hand-edited file without a final newline: end that line first
+					f.write("\r\n")
+		writer.writerows(matrix)
+		f.flush()
+		os.fsync(f.fileno())
+
+
+def _file_bytes(path: str) -> bytes:
+	"""Raw file contents, re-read only when the file's stat signature changes."""
+	stat_key = _stat_key(path)
+	cached = _EXPORT_CACHE.get(path)
+	if cached is None or cached[0] != stat_key:
+		with open(path, mode="rb") as f:
+			cached = (stat_key, f.read())
+		_EXPORT_CACHE[path] = cached
+	return cached[1]
+
+
+def _read_csv_frame(source):
+	"""Parse a CSV file path or uploaded bytes with pandas' C parser into an all-string DataFrame (missing cells as "")."""
+	def open_source():
+		return BytesIO(source) if isinstance(source, bytes) else source
+
+	opts = {"dtype": str, "keep_default_na": False, "index_col": False}
+	# Rows with more fields than the header keep the named columns, as csv.DictReader did
+	with warnings.catch_warnings():
+		warnings.simplefilter("ignore", pd.errors.ParserWarning)
+		try:
+			df = pd.read_csv(open_source(), engine="c", **opts)
+		except pd.errors.EmptyDataError:
+			return pd.DataFrame()
+		except pd.errors.ParserError:
+			df = pd.read_csv(open_source(), engine="python", on_bad_lines=lambda fields: fields, **opts)
+	return df.fillna("")
+
+
+def _todos_path() -> str:
+	"""File backing the todos; parquet mode reads the CSV until the first flush creates the parquet file."""
+	if STORAGE_FORMAT == "parquet" and os.path.exists(PARQUET_PATH):
+		return PARQUET_PATH
+	return CSV_PATH
+
+
+def _hours(value) -> float:
+	"""Hours as a float rounded to 2 places ("" or unparseable -> 0.0)."""
+	try:
+		return round(float(value or 0), 2)
+	except (TypeError, ValueError):
+		return 0.0
+
+
+def _numeric_row(row: Dict[str, Any]) -> Dict[str, Any]:
+	for name in HOURS_FIELDS:
+		row[name] = _hours(row.get(name))
+	return row
+
+
+def _todo_matrix(rows: List[Dict[str, Any]]) -> List[List[Any]]:
+	"""Like _row_matrix for todos, formatting the numeric hours columns as 2-decimal strings."""
+	matrix = _row_matrix(CSV_HEADERS, rows)
+	for values in matrix:
+		values[_EST_COL] = f"{values[_EST_COL] or 0:.2f}"
+		values[_LOGGED_COL] = f"{values[_LOGGED_COL] or 0:.2f}"
+	return matrix
+
+
+def _read_todos_file(path: str) -> List[Dict[str, Any]]:
+	df = pd.read_parquet(path) if path == PARQUET_PATH else _read_csv_frame(path)
+	# Hours are parsed once here and stay floats in memory; they are formatted again on write
+	for name in HOURS_FIELDS:
+		df[name] = pd.to_numeric(df[name], errors="coerce").fillna(0.0).round(2) if name in df.columns else 0.0
+	return df.to_dict("records")
+
+
+def _reindex() -> None:
+	global _TODO_INDEX
+	_TODO_INDEX = {}
+	for row in _TODOS:
+		# Keep the first row per id, matching the old scan-and-break updaters
+		_TODO_INDEX.setdefault(row["id"], row)
+
+
+def _replay(entry: Dict[str, Any]) -> None:
+	if entry["op"] == "set":
+		# Journals written before hours were kept numeric hold them as strings
+		row = _numeric_row(entry["row"])
+		current = _TODO_INDEX.get(row["id"])
+		if current is None:
+			_TODOS.append(row)
+			_TODO_INDEX[row["id"]] = row
+		else:
+			current.update(row)
+	elif entry["op"] == "delete":
+		_TODOS[:] = [r for r in _TODOS if r["id"] != entry["id"]]
+		_TODO_INDEX.pop(entry["id"], None)
+
+
+def _load_todos() -> List[Dict[str, Any]]:
+	global _TODOS, _JOURNAL_ENTRIES, _TODOS_STAT
 	ensure_csv_exists()
-	rows: List[Dict[str, Any]] = []
-	with open(CSV_PATH, mode="r", newline="") as f:
-		reader = csv.DictReader(f)
-		for row in reader:
-			rows.append(row)
-	return rows
+	# Reparse only on first use or if the store was changed outside this process
+	path = _todos_path()
+	if _TODOS is None or _stat_key(path) != _TODOS_STAT:
+		_TODOS = _read_todos_file(path)
+		_TODOS_STAT = _stat_key(path)
+		_reindex()
+		_JOURNAL_ENTRIES = 0
+		# Re-apply changes that were journaled but not yet flushed (e.g. after a crash)
+		if os.path.exists(JOURNAL_PATH):
+			with open(JOURNAL_PATH, mode="r", encoding="utf-8") as f:
+				for line in f:
+					if line.strip():
+						_replay(json.loads(line))
+						_JOURNAL_ENTRIES += 1
+	return _TODOS
+
+
+def _journal(entries: List[Dict[str, Any]]) -> None:
+	"""Append change entries to the journal, flushing to the CSV every JOURNAL_FLUSH_EVERY entries."""
+	global _JOURNAL_ENTRIES
+	if not entries:
+		return
+	with open(JOURNAL_PATH, mode="a", encoding="utf-8") as f:
+		f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+	_JOURNAL_ENTRIES += len(entries)
+	if _JOURNAL_ENTRIES >= JOURNAL_FLUSH_EVERY:
+		flush_todos()
+
+
+def flush_todos() -> None:
+	"""Fold pending journal entries into the todo store and truncate the journal.
+
+	A no-op when nothing is journaled. If the store file was edited outside this process,
+	it is reloaded first and the journal replayed on top, so the outside edit is kept.
+	"""
+	with _TODOS_LOCK:
+		if _TODOS is None:
+			return
+		_load_todos()
+		if not _JOURNAL_ENTRIES and not os.path.exists(JOURNAL_PATH):
+			return
+		_write_snapshot()
+
+
+def _write_snapshot() -> None:
+	"""Rewrite the todo store from memory (atomically) and truncate the journal."""
+	global _JOURNAL_ENTRIES, _TODOS_STAT
+	with _TODOS_LOCK:
+		ensure_csv_exists()
+		if STORAGE_FORMAT == "parquet":
+			path = PARQUET_PATH
+			# Serialized in memory first, so a failing to_parquet leaves nothing on disk
+			buf = BytesIO()
+			pd.DataFrame(_TODOS, columns=CSV_HEADERS).fillna("").to_parquet(buf, index=False, compression="zstd")
+			_atomic_write_bytes(path, buf.getvalue())
+		else:
+			path = CSV_PATH
+			_atomic_write_matrix(path, CSV_HEADERS, _todo_matrix(_TODOS))
+		_TODOS_STAT = _stat_key(path)
+		if os.path.exists(JOURNAL_PATH):
+			os.remove(JOURNAL_PATH)
+		_JOURNAL_ENTRIES = 0
+
+
+atexit.register(flush_todos)
+
+
+def todos_store_mtime() -> float:
+	"""Latest modification time of the todo store (CSV/parquet or journal); 0.0 if none exists."""
+	return max(
+		os.path.getmtime(path) if os.path.exists(path) else 0.0
+		for path in (_todos_path(), JOURNAL_PATH)
+	)
+
+
+def _update_rows(updates) -> None:
+	"""Apply (todo_id, mutator, value) updates in memory and journal each touched row once."""
+	with _TODOS_LOCK:
+		_load_todos()
+		touched: Dict[str, Dict[str, Any]] = {}
+		before: Dict[str, Dict[str, Any]] = {}
+		for todo_id, mutate, value in updates:
+			row = _TODO_INDEX.get(todo_id)
+			if row is not None:
+				before.setdefault(todo_id, dict(row))
+				mutate(row, value)
+				touched[todo_id] = row
+		# No-op updates (e.g. re-setting the current status on a rerun) write nothing
+		_journal([{"op": "set", "row": dict(row)} for todo_id, row in touched.items() if row != before[todo_id]])
+
+
+def read_todos() -> List[Dict[str, Any]]:
+	with _TODOS_LOCK:
+		# Copies, so callers can edit rows freely until they write_todos()
+		return [dict(row) for row in _load_todos()]
+
+
+def read_todos_df():
+	"""Todos as a DataFrame with every CSV column present (missing values as "")."""
+	return pd.DataFrame(read_todos(), columns=CSV_HEADERS).fillna("")
 
 
 def write_todos(rows: List[Dict[str, Any]]) -> None:
-	ensure_csv_exists()
-	with open(CSV_PATH, mode="w", newline="") as f:
-		writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
-		writer.writeheader()
-		for row in rows:
-			writer.writerow(row)
+	global _TODOS
+	with _TODOS_LOCK:
+		_TODOS = [_numeric_row(dict(row)) for row in rows]
+		_reindex()
+		_write_snapshot()
 
 
 def export_todos_csv() -> bytes:
 	"""Return current todos as CSV bytes."""
-	rows = read_todos()
-	from io import StringIO
+	ensure_csv_exists()
+	# With no unflushed journal the CSV on disk is already the export
+	if STORAGE_FORMAT == "csv" and not os.path.exists(JOURNAL_PATH):
+		return _file_bytes(CSV_PATH)
+	with _TODOS_LOCK:
+		_load_todos()
+		matrix = _todo_matrix(_TODOS)
 	sio = StringIO()
-	writer = csv.DictWriter(sio, fieldnames=CSV_HEADERS)
-	writer.writeheader()
-	for r in rows:
-		writer.writerow(r)
+	writer = csv.writer(sio)
+	writer.writerow(CSV_HEADERS)
+	writer.writerows(matrix)
 	return sio.getvalue().encode("utf-8")
 
 
 def csv_template_bytes() -> bytes:
 	"""Return a CSV template with headers and an example row (id optional)."""
-	from io import StringIO
 	sio = StringIO()
 	writer = csv.DictWriter(sio, fieldnames=CSV_HEADERS)
 	writer.writeheader()
@@ -106,192 +468,231 @@ def csv_template_bytes() -> bytes:
 	return sio.getvalue().encode("utf-8")
 
 
+def _normalize_completed_dates(raw):
+	"""Vectorized completed_at normalization to YYYY-MM-DD (dateutil only for non-ISO values)."""
+	iso = raw.str.match(r"\d{4}-\d{2}-\d{2}")
+	out = raw.str.slice(0, 10).where(iso | (raw == ""), "")
+	other = raw[~iso & (raw != "")]
+	if len(other):
+		from dateutil import parser as dtparser
+		def norm(text: str) -> str:
+			try:
+				return dtparser.parse(text).date().isoformat()
+			except Exception:
+				return text[:10]
+		parsed = {text: norm(text) for text in other.unique()}
+		out[other.index] = other.map(parsed)
+	return out
+
+
 def import_todos_csv(content: bytes, mode: str = "append") -> Dict[str, Any]:
 	"""Import todos from uploaded CSV bytes.
 
 	mode: "append" or "replace". Missing ids will be generated. Fields coerced.
 	Returns summary dict with counts.
 	"""
+	global _TODOS_STAT
 	assert mode in ("append", "replace")
 	ensure_csv_exists()
-	from io import StringIO
-	text = content.decode("utf-8")
-	reader = csv.DictReader(StringIO(text))
-	missing_core = [c for c in ["title","due_date","estimated_hours","priority","status"] if c not in reader.fieldnames and not set(["category","project","task"]).issubset(set(reader.fieldnames or []))]
+	df = _read_csv_frame(content)
+	fieldnames = set(df.columns)
+	# category/project/task can stand in for any missing core column (the title is composed from them)
+	has_fallback = {"category", "project", "task"}.issubset(fieldnames)
+	missing_core = [] if has_fallback else [c for c in ("title", "due_date", "estimated_hours", "priority", "status") if c not in fieldnames]
 	if missing_core:
 		return {"ok": False, "error": f"Missing required columns: {', '.join(missing_core)}"}
 
-	existing = [] if mode == "replace" else read_todos()
-	added = 0
-	for row in reader:
-		# Compose title from category/project/task if title absent
-		title_csv = (row.get("title") or "").strip()
-		if not title_csv:
-			category = (row.get("category") or "").strip()
-			project = (row.get("project") or "").strip()
-			task = (row.get("task") or "").strip()
-			parts = [p for p in [category, project, task] if p]
-			title_csv = " / ".join(parts)
-		if not title_csv:
-			continue
-		# Normalize completed_at to YYYY-MM-DD if provided
-		completed_at_raw = (row.get("completed_at") or "").strip()
-		if completed_at_raw:
-			try:
-				completed_at_parsed = dtparser.parse(completed_at_raw)
-				completed_at_norm = completed_at_parsed.date().isoformat()
-			except Exception:
-				completed_at_norm = completed_at_raw[:10]
-		else:
-			completed_at_norm = ""
-
-		new_row = {
-			"id": (row.get("id") or "").strip() or generate_ulid(),
-			"title": title_csv,
-			"due_date": (row.get("due_date") or "").strip(),
-			"estimated_hours": f"{float(row.get('estimated_hours') or 0):.2f}",
-			"hours_logged": f"{float(row.get('hours_logged') or 0):.2f}",
-			"priority": (row.get("priority") or "Medium").strip() or "Medium",
-			"status": (row.get("status") or "todo").strip() or "todo",
-			"steps": (row.get("steps") or "").strip(),
-			"created_at": (row.get("created_at") or datetime.now(pytz.timezone('America/New_York')).isoformat()),
-			"completed_at": completed_at_norm,
-		}
-		existing.append(new_row)
-		added += 1
-
-	write_todos(existing)
-	return {"ok": True, "added": added, "total": len(existing)}
+	def col(name: str):
+		return df[name].astype(str) if name in fieldnames else pd.Series("", index=df.index, dtype=str)
+
+	# Compose title from category/project/task if title absent
+	title = col("title").str.strip()
+	composed = pd.Series("", index=df.index, dtype=str)
+	for name in ("category", "project", "task"):
+		part = col(name).str.strip()
+		composed = composed + (" / " + part).where(part != "", "")
+	title = title.where(title != "", composed.str.slice(3))
+	keep = title != ""
+	df, title = df[keep], title[keep]
+
+	out = pd.DataFrame({"id": col("id").str.strip(), "title": title})
+	blank_ids = out["id"] == ""
+	out.loc[blank_ids, "id"] = _ulid_batch(int(blank_ids.sum()))
+	out["due_date"] = col("due_date").str.strip()
+	for name in ("estimated_hours", "hours_logged"):
+		out[name] = pd.to_numeric(col(name).str.strip(), errors="coerce").fillna(0.0).round(2)
+	# Unknown or blank values fall back to the defaults; object dtype keeps the shared canonical strings
+	out["priority"] = pd.Series([_PRIORITIES.get(p, "Medium") for p in col("priority").str.strip().str.lower().tolist()], index=out.index, dtype=object)
+	out["status"] = pd.Series([_STATUSES.get(s, "todo") for s in col("status").str.strip().str.lower().tolist()], index=out.index, dtype=object)
+	out["steps"] = col("steps").str.strip()
+	created_at = col("created_at")
+	out["created_at"] = created_at.where(created_at != "", datetime.now(_ny_tz()).isoformat())
+	out["completed_at"] = _normalize_completed_dates(col("completed_at").str.strip())
+
+	new_rows = out[CSV_HEADERS].to_dict("records")
+	if mode == "replace":
+		write_todos(new_rows)
+		return {"ok": True, "added": len(new_rows), "total": len(new_rows)}
+	with _TODOS_LOCK:
+		rows = _load_todos()
+		if STORAGE_FORMAT == "parquet":
+			write_todos(rows + new_rows)
+			return {"ok": True, "added": len(new_rows), "total": len(new_rows) + len(rows)}
+		# Appending only the new rows requires the CSV to match memory, i.e. no pending journal
+		if _JOURNAL_ENTRIES or os.path.exists(JOURNAL_PATH):
+			flush_todos()
+		_append_csv(CSV_PATH, CSV_HEADERS, _todo_matrix(new_rows))
+		rows.extend(new_rows)
+		for row in new_rows:
+			_TODO_INDEX.setdefault(row["id"], row)
+		_TODOS_STAT = _stat_key(CSV_PATH)
+		return {"ok": True, "added": len(new_rows), "total": len(rows)}
 
 
 def add_todo(title: str, due_date: str, estimated_hours: float, priority: str, steps: str = "") -> Dict[str, Any]:
-	rows = read_todos()
 	new_row = {
 		"id": generate_ulid(),
 		"title": title.strip(),
 		"due_date": due_date,
-		"estimated_hours": f"{float(estimated_hours):.2f}",
-		"hours_logged": f"{0.0:.2f}",
+		"estimated_hours": _hours(estimated_hours),
+		"hours_logged": 0.0,
 		"priority": priority,
 		"status": "todo",
 		"steps": steps.strip(),
-		"created_at": datetime.now(pytz.timezone('America/New_York')).isoformat(),
+		"created_at": datetime.now(_ny_tz()).isoformat(),
 		"completed_at": "",
 	}
-	rows.append(new_row)
-	write_todos(rows)
+	with _TODOS_LOCK:
+		_load_todos()
+		_replay({"op": "set", "row": dict(new_row)})
+		_journal([{"op": "set", "row": new_row}])
 	return new_row
 
 
+def _apply_status(row: Dict[str, Any], status: str) -> None:
+	row["status"] = status
+	# Auto-log hours and set completion timestamp when marking as done
+	if status == "done":
+		# Set completion date (YYYY-MM-DD)
+		row["completed_at"] = _today_ny_iso()
+		# Auto-log hours if not already logged
+		if row["hours_logged"] == 0:
+			estimated_hours = row["estimated_hours"]
+			if estimated_hours == 0:
+				# Default to 1 hour if no estimated hours
+				estimated_hours = 1.0
+				row["estimated_hours"] = 1.0
+			row["hours_logged"] = estimated_hours
+	else:
+		# Clear completion timestamp if marking as not done
+		row["completed_at"] = ""
+
+
 def update_todo_status(todo_id: str, status: str) -> None:
-	rows = read_todos()
-	for row in rows:
-		if row["id"] == todo_id:
-			row["status"] = status
-			# Auto-log hours and set completion timestamp when marking as done
-			if status == "done":
-				# Set completion date (YYYY-MM-DD)
-				row["completed_at"] = datetime.now(pytz.timezone('America/New_York')).date().isoformat()
-				# Auto-log hours if not already logged
-				if float(row.get("hours_logged", 0)) == 0:
-					estimated_hours = float(row.get("estimated_hours", 0))
-					if estimated_hours == 0:
-						# Default to 1 hour if no estimated hours
-						estimated_hours = 1.0
-						row["estimated_hours"] = "1.00"
-					row["hours_logged"] = f"{estimated_hours:.2f}"
-			else:
-				# Clear completion timestamp if marking as not done
-				row["completed_at"] = ""
-			break
-	write_todos(rows)
+	_update_rows([(todo_id, _apply_status, status)])
+
+
+def bulk_update_status(ids, status: str) -> None:
+	"""Set the status of several todos with a single journal append."""
+	_update_rows((todo_id, _apply_status, status) for todo_id in dict.fromkeys(ids))
+
+
+def _apply_hours_delta(row: Dict[str, Any], hours_delta: float) -> None:
+	row["hours_logged"] = round(max(0.0, row["hours_logged"] + hours_delta), 2)
 
 
 def update_todo_hours(todo_id: str, hours_delta: float) -> None:
-	rows = read_todos()
-	for row in rows:
-		if row["id"] == todo_id:
-			current = float(row.get("hours_logged", 0) or 0)
-			row["hours_logged"] = f"{max(0.0, current + hours_delta):.2f}"
-			break
-	write_todos(rows)
+	_update_rows([(todo_id, _apply_hours_delta, hours_delta)])
+
+
+def _apply_estimated_hours(row: Dict[str, Any], estimated_hours) -> None:
+	# Convert to float to handle string inputs
+	estimated_hours_float = float(estimated_hours) if estimated_hours is not None else 0.0
+	row["estimated_hours"] = round(max(0.0, estimated_hours_float), 2)
 
 
 def update_todo_estimated_hours(todo_id: str, estimated_hours) -> None:
 	"""Update the estimated hours for a specific todo."""
-	rows = read_todos()
-	for row in rows:
-		if row["id"] == todo_id:
-			# Convert to float to handle string inputs
-			estimated_hours_float = float(estimated_hours) if estimated_hours is not None else 0.0
-			row["estimated_hours"] = f"{max(0.0, estimated_hours_float):.2f}"
-			break
-	write_todos(rows)
+	_update_rows([(todo_id, _apply_estimated_hours, estimated_hours)])
+
+
+def _apply_due_date(row: Dict[str, Any], due_date) -> None:
+	# Convert to string format if it's a datetime object
+	if hasattr(due_date, 'strftime'):
+		row["due_date"] = due_date.strftime('%Y-%m-%d')
+	else:
+		row["due_date"] = str(due_date)
 
 
 def update_todo_due_date(todo_id: str, due_date) -> None:
 	"""Update the due date for a specific todo."""
-	rows = read_todos()
-	for row in rows:
-		if row["id"] == todo_id:
-			# Convert to string format if it's a datetime object
-			if hasattr(due_date, 'strftime'):
-				row["due_date"] = due_date.strftime('%Y-%m-%d')
-			else:
-				row["due_date"] = str(due_date)
-			break
-	write_todos(rows)
+	_update_rows([(todo_id, _apply_due_date, due_date)])
+
+
+def _apply_completed_at(row: Dict[str, Any], completed_at) -> None:
+	# Normalize to date-only YYYY-MM-DD
+	value = completed_at
+	if hasattr(value, 'strftime'):
+		row["completed_at"] = value.strftime('%Y-%m-%d')
+	else:
+		text = str(value).strip() if value else ""
+		if text:
+			from dateutil import parser as dtparser
+			try:
+				dt = dtparser.parse(text)
+				row["completed_at"] = dt.date().isoformat()
+			except Exception:
+				# Fallback: take first 10 chars assuming YYYY-MM-DD prefix
+				row["completed_at"] = text[:10]
+		else:
+			row["completed_at"] = ""
 
 
 def update_todo_completed_at(todo_id: str, completed_at) -> None:
 	"""Update the completion timestamp for a specific todo."""
-	rows = read_todos()
-	for row in rows:
-		if row["id"] == todo_id:
-			# Normalize to date-only YYYY-MM-DD
-			value = completed_at
-			if hasattr(value, 'strftime'):
-				row["completed_at"] = value.strftime('%Y-%m-%d')
-			else:
-				text = str(value).strip() if value else ""
-				if text:
-					try:
-						dt = dtparser.parse(text)
-						row["completed_at"] = dt.date().isoformat()
-					except Exception:
-						# Fallback: take first 10 chars assuming YYYY-MM-DD prefix
-						row["completed_at"] = text[:10]
-				else:
-					row["completed_at"] = ""
-			break
-	write_todos(rows)
+	_update_rows([(todo_id, _apply_completed_at, completed_at)])
 
 
 def delete_todo(todo_id: str) -> None:
-	rows = read_todos()
-	rows = [r for r in rows if r["id"] != todo_id]
-	write_todos(rows)
+	bulk_delete([todo_id])
+
+
+def bulk_delete(ids) -> None:
+	"""Delete several todos, journaling one entry per id."""
+	with _TODOS_LOCK:
+		_load_todos()
+		ids = {todo_id for todo_id in ids if todo_id in _TODO_INDEX}
+		if not ids:
+			return
+		# One pass over the rows for the whole batch; the index gives the membership test
+		_TODOS[:] = [r for r in _TODOS if r["id"] not in ids]
+		for todo_id in ids:
+			del _TODO_INDEX[todo_id]
+		_journal([{"op": "delete", "id": todo_id} for todo_id in ids])
 
 
 # --- Timetable helpers ---
 
-def read_timetable() -> List[Dict[str, Any]]:
+def _load_timetable() -> List[Dict[str, Any]]:
+	"""Cached timetable rows (not copies), reparsed when the file's stat signature changes."""
+	global _TIMETABLE_CACHE
 	ensure_csv_exists()
-	rows: List[Dict[str, Any]] = []
-	with open(TIMETABLE_CSV_PATH, mode="r", newline="") as f:
-		reader = csv.DictReader(f)
-		for row in reader:
-			rows.append(row)
-	return rows
+	stat_key = _stat_key(TIMETABLE_CSV_PATH)
+	if _TIMETABLE_CACHE is None or _TIMETABLE_CACHE[0] != stat_key:
+		_TIMETABLE_CACHE = (stat_key, _read_csv_frame(TIMETABLE_CSV_PATH).to_dict("records"))
+	return _TIMETABLE_CACHE[1]
+
+
+def read_timetable() -> List[Dict[str, Any]]:
+	# Copies, so callers can edit rows without touching the cache
+	return [dict(row) for row in _load_timetable()]
 
 
 def write_timetable(rows: List[Dict[str, Any]]) -> None:
+	global _TIMETABLE_CACHE
 	ensure_csv_exists()
-	with open(TIMETABLE_CSV_PATH, mode="w", newline="") as f:
-		writer = csv.DictWriter(f, fieldnames=TIMETABLE_HEADERS)
-		writer.writeheader()
-		for r in rows:
-			writer.writerow(r)
+	_atomic_write_csv(TIMETABLE_CSV_PATH, TIMETABLE_HEADERS, rows)
+	_TIMETABLE_CACHE = (_stat_key(TIMETABLE_CSV_PATH), [dict(r) for r in rows])
 
 
 def add_timetable_entry(day: str, start_time: str, end_time: str, activity: str, focus: str) -> Dict[str, Any]:
@@ -315,18 +716,12 @@ def delete_timetable_entry(entry_id: str) -> None:
 
 
 def export_timetable_csv() -> bytes:
-	rows = read_timetable()
-	from io import StringIO
-	sio = StringIO()
-	writer = csv.DictWriter(sio, fieldnames=TIMETABLE_HEADERS)
-	writer.writeheader()
-	for r in rows:
-		writer.writerow(r)
-	return sio.getvalue().encode("utf-8")
+	"""Return the timetable as CSV bytes (the file as written by write_timetable)."""
+	ensure_csv_exists()
+	return _file_bytes(TIMETABLE_CSV_PATH)
 
 
 def timetable_template_bytes() -> bytes:
-	from io import StringIO
 	sio = StringIO()
 	writer = csv.DictWriter(sio, fieldnames=TIMETABLE_HEADERS)
 	writer.writeheader()
@@ -342,141 +737,146 @@ def timetable_template_bytes() -> bytes:
 
 
 def import_timetable_csv(content: bytes, mode: str = "append") -> Dict[str, Any]:
+	global _TIMETABLE_CACHE
 	assert mode in ("append", "replace")
 	ensure_csv_exists()
-	from io import StringIO
-	reader = csv.DictReader(StringIO(content.decode("utf-8")))
-	missing = [c for c in TIMETABLE_HEADERS if c not in reader.fieldnames]
+	df = _read_csv_frame(content)
+	missing = [c for c in TIMETABLE_HEADERS if c not in df.columns]
 	if missing:
 		return {"ok": False, "error": f"Missing columns: {', '.join(missing)}"}
-	existing = [] if mode == "replace" else read_timetable()
-	added = 0
-	for row in reader:
+	new_rows: List[Dict[str, Any]] = []
+	id_iter = _ulid_iter()
+	for row in df.to_dict("records"):
 		activity = (row.get("activity") or "").strip()
 		day = (row.get("day") or "").strip()
+		day = _DAYS.get(day.lower(), day)
 		if not activity or not day:
 			continue
-		existing.append({
-			"id": (row.get("id") or "").strip() or generate_ulid(),
+		new_rows.append({
+			"id": (row.get("id") or "").strip() or next(id_iter),
 			"day": day,
 			"start_time": (row.get("start_time") or "").strip(),
 			"end_time": (row.get("end_time") or "").strip(),
 			"activity": activity,
 			"focus": (row.get("focus") or "").strip(),
 		})
-		added += 1
-	write_timetable(existing)
-	return {"ok": True, "added": added, "total": len(existing)}
-
-
-def seed_example_timetable() -> None:
-	"""Populate timetable with a predefined weekly schedule derived from the user's example."""
-	entries = []
-	def add(day, start, end, activity, focus=""):
-		entries.append({
-			"id": generate_ulid(),
-			"day": day,
-			"start_time": start,
-			"end_time": end,
-			"activity": activity,
-			"focus": focus,
-		})
-
+	if mode == "replace":
+		write_timetable(new_rows)
+		return {"ok": True, "added": len(new_rows), "total": len(new_rows)}
+	# Append only the new rows to the file and the cached parse
+	rows = _load_timetable()
+	_append_csv(TIMETABLE_CSV_PATH, TIMETABLE_HEADERS, _row_matrix(TIMETABLE_HEADERS, new_rows))
+	rows.extend(new_rows)
+	_TIMETABLE_CACHE = (_stat_key(TIMETABLE_CSV_PATH), rows)
+	return {"ok": True, "added": len(new_rows), "total": len(rows)}
+
+
+# Predefined weekly schedule derived from the user's example: (day, start, end, activity, focus)
+_SEED_ROWS = (
 	# Monday
-	add("Monday","07:00","08:00","Gym + Morning Routine + Breakfast","Personal well-being")
-	add("Monday","08:00","09:00","Gym + Morning Routine + Breakfast","Personal well-being")
-	add("Monday","10:30","11:30","School Project","Data Product Design & Taskconnect")
-	add("Monday","11:30","12:30","Break","")
-	add("Monday","12:30","13:30","School Work","Cloud Computing")
-	add("Monday","13:30","15:00","Lunch","")
-	add("Monday","15:00","20:00","Lecture","")
+	("Monday","07:00","08:00","Gym + Morning Routine + Breakfast","Personal well-being"),
+	("Monday","08:00","09:00","Gym + Morning Routine + Breakfast","Personal well-being"),
+	("Monday","10:30","11:30","School Project","Data Product Design & Taskconnect"),
+	("Monday","11:30","12:30","Break",""),
+	("Monday","12:30","13:30","School Work","Cloud Computing"),
+	("Monday","13:30","15:00","Lunch",""),
+	("Monday","15:00","20:00","Lecture",""),
 
 	# Tuesday
-	add("Tuesday","07:00","08:00","Morning Routine + Breakfast","Personal well-being")
-	add("Tuesday","08:00","09:00","Morning Routine + Breakfast","Personal well-being")
-	add("Tuesday","09:00","15:00","Lectures & Commute","")
-	add("Tuesday","15:00","20:00","Day End","Half-Day Off")
+	("Tuesday","07:00","08:00","Morning Routine + Breakfast","Personal well-being"),
+	("Tuesday","08:00","09:00","Morning Routine + Breakfast","Personal well-being"),
+	("Tuesday","09:00","15:00","Lectures & Commute",""),
+	("Tuesday","15:00","20:00","Day End","Half-Day Off"),
 
 	# Wednesday
-	add("Wednesday","07:00","08:00","Gym","Personal well-being")
-	add("Wednesday","08:00","10:30","Morning Routine + Breakfast","Personal well-being")
-	add("Wednesday","10:30","11:30","School Project Deep Work","Data Product Design or Driving License")
-	add("Wednesday","11:30","12:30","Break","")
-	add("Wednesday","12:30","13:30","School Project Deep Work","Cloud Computing")
-	add("Wednesday","13:30","15:00","Lunch","")
-	add("Wednesday","14:30","15:30","Assignments","Computational Maths Assignment")
-	add("Wednesday","15:30","16:30","Break","")
-	add("Wednesday","16:30","17:30","Personal Projects","TaskConnect")
-	add("Wednesday","17:30","18:30","Dinner / Relax","")
-	add("Wednesday","18:30","19:30","Tutorials","Aws Cloud Practitioner")
-	add("Wednesday","19:30","20:30","Break","")
+	("Wednesday","07:00","08:00","Gym","Personal well-being"),
+	("Wednesday","08:00","10:30","Morning Routine + Breakfast","Personal well-being"),
+	("Wednesday","10:30","11:30","School Project Deep Work","Data Product Design or Driving License"),
+	("Wednesday","11:30","12:30","Break",""),
+	("Wednesday","12:30","13:30","School Project Deep Work","Cloud Computing"),
+	("Wednesday","13:30","15:00","Lunch",""),
+	("Wednesday","14:30","15:30","Assignments","Computational Maths Assignment"),
+	("Wednesday","15:30","16:30","Break",""),
+	("Wednesday","16:30","17:30","Personal Projects","TaskConnect"),
+	("Wednesday","17:30","18:30","Dinner / Relax",""),
+	("Wednesday","18:30","19:30","Tutorials","Aws Cloud Practitioner"),
+	("Wednesday","19:30","20:30","Break",""),
 
 	# Thursday
-	add("Thursday","07:00","08:00","Gym","Personal well-being")
-	add("Thursday","08:00","10:30","Morning Routine + Breakfast","Personal well-being")
-	add("Thursday","10:30","11:30","School Project Deep Work","Cloud Computing")
-	add("Thursday","11:30","12:30","Break","")
-	add("Thursday","12:30","13:30","Personal Projects","Fraud Detection")
-	add("Thursday","13:30","14:30","Lunch","")
-	add("Thursday","14:30","15:30","Assignments","Computational Maths Lab")
-	add("Thursday","15:30","16:30","Break","")
-	add("Thursday","16:30","17:30","Personal Projects","TaskConnect")
-	add("Thursday","17:30","18:30","Dinner / Relax","")
-	add("Thursday","18:30","19:30","Tutorials","Harvad Data Science")
-	add("Thursday","19:30","20:30","Break","")
+	("Thursday","07:00","08:00","Gym","Personal well-being"),
+	("Thursday","08:00","10:30","Morning Routine + Breakfast","Personal well-being"),
+	("Thursday","10:30","11:30","School Project Deep Work","Cloud Computing"),
+	("Thursday","11:30","12:30","Break",""),
+	("Thursday","12:30","13:30","Personal Projects","Fraud Detection"),
+	("Thursday","13:30","14:30","Lunch",""),
+	("Thursday","14:30","15:30","Assignments","Computational Maths Lab"),
+	("Thursday","15:30","16:30","Break",""),
+	("Thursday","16:30","17:30","Personal Projects","TaskConnect"),
+	("Thursday","17:30","18:30","Dinner / Relax",""),
+	("Thursday","18:30","19:30","Tutorials","Harvad Data Science"),
+	("Thursday","19:30","20:30","Break",""),
 
 	# Friday
-	add("Friday","07:00","08:00","Gym","Personal well-being")
-	add("Friday","08:00","10:30","Morning Routine + Breakfast","Personal well-being")
-	add("Friday","10:30","11:30","School Work","Computational Maths")
-	add("Friday","11:30","12:30","Break","")
-	add("Friday","12:30","13:30","School Project Deep Work","Data Product Design")
-	add("Friday","13:30","14:30","Lunch","")
-	add("Friday","14:30","15:30","Assignments","Cloud Computing")
-	add("Friday","15:30","16:30","Break","")
-	add("Friday","16:30","17:30","Personal Projects","TaskConnect")
-	add("Friday","17:30","18:30","Dinner / Relax","")
-	add("Friday","18:30","19:30","Tutorials","Harvad Data Science")
-	add("Friday","19:30","20:30","Break","")
+	("Friday","07:00","08:00","Gym","Personal well-being"),
+	("Friday","08:00","10:30","Morning Routine + Breakfast","Personal well-being"),
+	("Friday","10:30","11:30","School Work","Computational Maths"),
+	("Friday","11:30","12:30","Break",""),
+	("Friday","12:30","13:30","School Project Deep Work","Data Product Design"),
+	("Friday","13:30","14:30","Lunch",""),
+	("Friday","14:30","15:30","Assignments","Cloud Computing"),
+	("Friday","15:30","16:30","Break",""),
+	("Friday","16:30","17:30","Personal Projects","TaskConnect"),
+	("Friday","17:30","18:30","Dinner / Relax",""),
+	("Friday","18:30","19:30","Tutorials","Harvad Data Science"),
+	("Friday","19:30","20:30","Break",""),
 
 	# Saturday
-	add("Saturday","07:00","08:00","Gym","Personal well-being")
-	add("Saturday","08:00","10:30","Morning Routine + Breakfast","Personal well-being")
-	add("Saturday","10:30","11:30","Personal Project Deep Work","TaskConnect")
-	add("Saturday","11:30","12:30","Break","")
-	add("Saturday","12:30","13:30","Personal Project Deep Work","Fraud Detection")
-	add("Saturday","13:30","20:00","Day End","Half-Day Off")
+	("Saturday","07:00","08:00","Gym","Personal well-being"),
+	("Saturday","08:00","10:30","Morning Routine + Breakfast","Personal well-being"),
+	("Saturday","10:30","11:30","Personal Project Deep Work","TaskConnect"),
+	("Saturday","11:30","12:30","Break",""),
+	("Saturday","12:30","13:30","Personal Project Deep Work","Fraud Detection"),
+	("Saturday","13:30","20:00","Day End","Half-Day Off"),
 
 	# Sunday
-	add("Sunday","07:00","08:00","Morning Routine + Breakfast","Personal well-being")
-	add("Sunday","08:00","10:30","Morning Routine + Breakfast","Personal well-being")
-	add("Sunday","10:30","11:30","Weekly Review","Assess Progress")
-	add("Sunday","11:30","12:30","Break","")
-	add("Sunday","12:30","13:30","Tutorials","Harvad Data Science")
-	add("Sunday","13:30","14:30","Lunch","")
-	add("Sunday","14:30","15:30","Catch-up / Flex Time","Unfinished labs or projects")
-	add("Sunday","15:30","16:30","Break","")
-	add("Sunday","16:30","17:30","Catch-up / Flex Time","Unfinished labs or projects")
-	add("Sunday","17:30","18:30","Dinner / Relax","")
-	add("Sunday","18:30","19:30","Prep Next Week","Set goals")
-	add("Sunday","19:30","20:30","Break","")
-
-	write_timetable(entries)
+	("Sunday","07:00","08:00","Morning Routine + Breakfast","Personal well-being"),
+	("Sunday","08:00","10:30","Morning Routine + Breakfast","Personal well-being"),
+	("Sunday","10:30","11:30","Weekly Review","Assess Progress"),
+	("Sunday","11:30","12:30","Break",""),
+	("Sunday","12:30","13:30","Tutorials","Harvad Data Science"),
+	("Sunday","13:30","14:30","Lunch",""),
+	("Sunday","14:30","15:30","Catch-up / Flex Time","Unfinished labs or projects"),
+	("Sunday","15:30","16:30","Break",""),
+	("Sunday","16:30","17:30","Catch-up / Flex Time","Unfinished labs or projects"),
+	("Sunday","17:30","18:30","Dinner / Relax",""),
+	("Sunday","18:30","19:30","Prep Next Week","Set goals"),
+	("Sunday","19:30","20:30","Break",""),
+)
 
 
-def seed_timetable_from_csv(file_path: str) -> Dict[str, Any]:
-	"""Load a human-formatted timetable CSV and convert to canonical rows.
+def seed_example_timetable() -> None:
+	"""Populate timetable with a predefined weekly schedule derived from the user's example."""
+	global _TIMETABLE_CACHE
+	ensure_csv_exists()
+	# Seed tuples are already in TIMETABLE_HEADERS order after the id, so no per-row dicts are needed
+	ids = _ulid_batch(len(_SEED_ROWS))
+	_atomic_write_matrix(TIMETABLE_CSV_PATH, TIMETABLE_HEADERS, [(id_, *row) for id_, row in zip(ids, _SEED_ROWS)])
+	_TIMETABLE_CACHE = None
+
+
+_TIME_SLOT_RE = re.compile(r"(\d{1,2}):(\d{2})\s*(AM|PM)?", re.IGNORECASE)
+
+
+def load_timetable_csv(file_path: str) -> Dict[str, Any]:
+	"""Parse a human-formatted timetable CSV into canonical rows without writing them.
 
 	Expected headers include at least: Day, Time Slot, Activity/Acitivity, Focus.
 	If Day is empty, reuse last non-empty day. Time Slot like '7:00 AM - 8:00 AM'.
 	Special end keyword 'Day End' maps to 20:00.
+	Returns {"ok": True, "rows": [...]} or {"ok": False, "error": ...}.
 	"""
-	ensure_csv_exists()
 	if not os.path.exists(file_path):
 		return {"ok": False, "error": f"File not found: {file_path}"}
-	from io import StringIO
-	import csv as _csv
-	from dateutil import parser as dtparser
 
 	def to_hhmm(text: str) -> str:
 		text = (text or "").strip()
@@ -484,7 +884,17 @@ def seed_timetable_from_csv(file_path: str) -> Dict[str, Any]:
 			return ""
 		if text.lower().startswith("day end"):
 			return "20:00"
+		# Common case 'H:MM AM/PM' (or 24h 'HH:MM') without dateutil's format guessing
+		# ('13:30 PM' and other out-of-range values fall through to dateutil, as before)
+		m = _TIME_SLOT_RE.fullmatch(text)
+		if m and not (m[3] and int(m[1]) > 12):
+			hour, minute = int(m[1]), int(m[2])
+			if m[3]:
+				hour = hour % 12 + (12 if m[3].upper() == "PM" else 0)
+			if hour < 24 and minute < 60:
+				return f"{hour:02d}:{minute:02d}"
 		# Normalize like '13:30 PM' -> '1:30 PM'
+		from dateutil import parser as dtparser
 		try:
 			# dtparser can handle many formats and AM/PM
 			dt = dtparser.parse(text)
@@ -494,10 +904,12 @@ def seed_timetable_from_csv(file_path: str) -> Dict[str, Any]:
 
 	rows_new: List[Dict[str, Any]] = []
 	last_day = None
+	id_iter = _ulid_iter()
 	with open(file_path, "r", newline="") as f:
-		reader = _csv.DictReader(f)
+		reader = csv.DictReader(f)
 		for r in reader:
-			day = (r.get("Day") or "").strip() or last_day
+			day = (r.get("Day") or "").strip()
+			day = _DAYS.get(day.lower(), day) or last_day
 			if not day:
 				continue
 			last_day = day
@@ -514,7 +926,7 @@ def seed_timetable_from_csv(file_path: str) -> Dict[str, Any]:
 			start_hhmm = to_hhmm(start_s)
 			end_hhmm = to_hhmm(end_s)
 			rows_new.append({
-				"id": generate_ulid(),
+				"id": next(id_iter),
 				"day": day,
 				"start_time": start_hhmm,
 				"end_time": end_hhmm,
@@ -524,33 +936,42 @@ def seed_timetable_from_csv(file_path: str) -> Dict[str, Any]:
 
 	if not rows_new:
 		return {"ok": False, "error": "No rows parsed"}
-	write_timetable(rows_new)
-	return {"ok": True, "added": len(rows_new)}
+	return {"ok": True, "rows": rows_new}
+
+
+def seed_timetable_from_csv(file_path: str) -> Dict[str, Any]:
+	"""Load a human-formatted timetable CSV (see load_timetable_csv) and replace the timetable with it."""
+	ensure_csv_exists()
+	res = load_timetable_csv(file_path)
+	if not res.get("ok"):
+		return res
+	write_timetable(res["rows"])
+	return {"ok": True, "added": len(res["rows"])}
 
 
 # --- Steps helpers ---
 
+@lru_cache(maxsize=1024)
+def _parse_step_lines(steps_str: str):
+	"""(index, description, completed) per step line; cached since the same strings are parsed every rerun."""
+	parsed = []
+	for i, line in enumerate(steps_str.strip().split('\n')):
+		line = line.strip()
+		# Steps start with '-' (pending) or '✓' (completed)
+		if line[:1] in ('-', '✓'):
+			parsed.append((i, line[1:].strip(), line[0] == '✓'))
+	return tuple(parsed)
+
+
 def parse_steps(steps_str: str) -> List[Dict[str, Any]]:
 	"""Parse steps from a string format. Each line starting with '-' or '✓' is a step."""
 	if not steps_str or not steps_str.strip():
 		return []
-	
-	steps = []
-	lines = steps_str.strip().split('\n')
-	for i, line in enumerate(lines):
-		line = line.strip()
-		if line.startswith('-') or line.startswith('✓'):
-			# Check if step is completed (starts with ✓)
-			completed = line.startswith('✓')
-			# Remove the prefix and get the description
-			step_text = line[1:].strip() if completed else line[1:].strip()
-			steps.append({
-				"id": f"step_{i}",
-				"description": step_text,
-				"completed": completed,
-				"order": i
-			})
-	return steps
+	# Fresh dicts each call: callers toggle "completed" in place
+	return [
+		{"id": f"step_{i}", "description": description, "completed": completed, "order": i}
+		for i, description, completed in _parse_step_lines(steps_str)
+	]
 
 
 def format_steps(steps_list: List[Dict[str, Any]]) -> str:
@@ -558,70 +979,97 @@ def format_steps(steps_list: List[Dict[str, Any]]) -> str:
 	if not steps_list:
 		return ""
 	
-	lines = []
-	for step in sorted(steps_list, key=lambda x: x.get("order", 0)):
-		status = "✓" if step.get("completed", False) else "-"
-		lines.append(f"{status} {step.get('description', '')}")
-	return "\n".join(lines)
+	return "\n".join(
+		f"{'✓' if step.get('completed', False) else '-'} {step.get('description', '')}"
+		for step in sorted(steps_list, key=lambda x: x.get("order", 0))
+	)
+
+
+def _apply_step(row: Dict[str, Any], step_change) -> None:
+	step_id, completed = step_change
+	steps = parse_steps(row.get("steps", ""))
+	for step in steps:
+		if step["id"] == step_id:
+			step["completed"] = completed
+			break
+	row["steps"] = format_steps(steps)
+	
+	# Auto-complete todo if all steps are completed
+	if steps and all(step.get("completed", False) for step in steps):
+		_apply_status(row, "done")
 
 
 def update_todo_step(todo_id: str, step_id: str, completed: bool) -> None:
 	"""Update a specific step's completion status and auto-complete todo if all steps done."""
-	rows = read_todos()
-	for row in rows:
-		if row["id"] == todo_id:
-			steps = parse_steps(row.get("steps", ""))
-			for step in steps:
-				if step["id"] == step_id:
-					step["completed"] = completed
-					break
-			row["steps"] = format_steps(steps)
-			
-			# Auto-complete todo if all steps are completed
-			if steps and all(step.get("completed", False) for step in steps):
-				row["status"] = "done"
-				# Set completion date (YYYY-MM-DD)
-				row["completed_at"] = datetime.now(pytz.timezone('America/New_York')).date().isoformat()
-				# Auto-log hours when auto-completing
-				if float(row.get("hours_logged", 0)) == 0:
-					estimated_hours = float(row.get("estimated_hours", 0))
-					if estimated_hours == 0:
-						# Default to 1 hour if no estimated hours
-						estimated_hours = 1.0
-						row["estimated_hours"] = "1.00"
-					row["hours_logged"] = f"{estimated_hours:.2f}"
-			
-			break
-	write_todos(rows)
+	_update_rows([(todo_id, _apply_step, (step_id, completed))])
+
+
+# Field name -> row mutator used by apply_updates; "hours_logged" takes a delta, "step" a (step_id, completed) pair
+_ROW_UPDATERS = {
+	"status": _apply_status,
+	"hours_logged": _apply_hours_delta,
+	"estimated_hours": _apply_estimated_hours,
+	"due_date": _apply_due_date,
+	"completed_at": _apply_completed_at,
+	"step": _apply_step,
+}
+
+
+def apply_updates(updates) -> None:
+	"""Apply (todo_id, field, value) updates in order, journaling each touched todo once."""
+	_update_rows((todo_id, _ROW_UPDATERS[field], value) for todo_id, field, value in updates)
+
+
+def _title_steps(row: Dict[str, Any]) -> List[Dict[str, Any]]:
+	"""Auto-generated single step for a todo whose title has a dash, e.g. "Category - Do X"."""
+	title_parts = row.get("title", "").split(" - ", 1)
+	if len(title_parts) > 1:
+		return [{
+			"id": "step_0",
+			"description": title_parts[1].strip(),
+			"completed": False,
+			"order": 0
+		}]
+	return []
 
 
 def get_todo_steps(todo_id: str) -> List[Dict[str, Any]]:
 	"""Get steps for a specific todo. If no steps exist but title has dash, auto-create step."""
-	rows = read_todos()
-	for row in rows:
-		if row["id"] == todo_id:
-			steps = parse_steps(row.get("steps", ""))
-			# If no steps but title has dash, auto-create a step and save it
-			if not steps and " - " in row.get("title", ""):
-				title_parts = row["title"].split(" - ", 1)
-				if len(title_parts) > 1:
-					step_description = title_parts[1].strip()
-					steps = [{
-						"id": "step_0",
-						"description": step_description,
-						"completed": False,
-						"order": 0
-					}]
-					# Save the auto-generated step back to the CSV
-					row["steps"] = format_steps(steps)
-					write_todos(rows)
-			return steps
-	return []
+	return read_all_steps((todo_id,)).get(todo_id, [])
 
 
-def get_todo_progress(todo_id: str) -> Dict[str, Any]:
-	"""Get progress information for a todo with steps."""
-	steps = get_todo_steps(todo_id)
+def _set_steps(row: Dict[str, Any], steps_str: str) -> None:
+	row["steps"] = steps_str
+
+
+def read_all_steps(todo_ids=None) -> Dict[str, List[Dict[str, Any]]]:
+	"""Steps for many todos keyed by todo id, looked up through the id index.
+
+	todo_ids limits the lookup (default: every todo). Todos without steps get the same
+	auto-generated step as get_todo_steps; any created steps are journaled together.
+	"""
+	with _TODOS_LOCK:
+		_load_todos()
+		if todo_ids is None:
+			rows = list(_TODO_INDEX.values())
+		else:
+			rows = [_TODO_INDEX[todo_id] for todo_id in dict.fromkeys(todo_ids) if todo_id in _TODO_INDEX]
+		steps_by_id: Dict[str, List[Dict[str, Any]]] = {}
+		created = []
+		for row in rows:
+			steps = parse_steps(row.get("steps", ""))
+			if not steps:
+				steps = _title_steps(row)
+				if steps:
+					created.append((row["id"], _set_steps, format_steps(steps)))
+			if steps:
+				steps_by_id[row["id"]] = steps
+		_update_rows(created)
+	return steps_by_id
+
+
+def steps_progress(steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+	"""Progress summary (total, completed, percentage) for a list of steps."""
 	if not steps:
 		return {"total": 0, "completed": 0, "percentage": 0}
 	
@@ -634,3 +1082,8 @@ def get_todo_progress(todo_id: str) -> Dict[str, Any]:
 		"completed": completed,
 		"percentage": round(percentage, 1)
 	}
+
+
+def get_todo_progress(todo_id: str) -> Dict[str, Any]:
+	"""Get progress information for a todo with steps."""
+	return steps_progress(get_todo_steps(todo_id))